@@ -0,0 +1,223 @@
+"""
+Benchmark the manifest loading and writing paths against a large, generated
+Dataset manifest.
+"""
+import os
+import tempfile
+from timeit import timeit
+from typing import Callable, Dict, List
+
+import yaml
+
+from fideslang import bundle, manifests, model_map, relationships
+from fideslang.models import Taxonomy
+from fideslang.parse import build_taxonomy, load_manifests_into_taxonomy
+
+COLLECTION_COUNT = 50
+FIELDS_PER_COLLECTION = 200
+ROUNDS = 3
+
+
+def build_dataset_manifest(
+    collection_count: int = COLLECTION_COUNT,
+    fields_per_collection: int = FIELDS_PER_COLLECTION,
+) -> Dict[str, List[Dict]]:
+    """
+    Build a single Dataset with `collection_count * fields_per_collection` fields.
+    """
+    return {
+        "dataset": [
+            {
+                "fides_key": "benchmark_dataset",
+                "name": "Benchmark Dataset",
+                "description": "A generated dataset used for benchmarking.",
+                "collections": [
+                    {
+                        "name": f"collection_{collection}",
+                        "fields": [
+                            {
+                                "name": f"field_{field}",
+                                "description": f"Field {field} of collection {collection}",
+                                "data_categories": ["user.contact.email"],
+                            }
+                            for field in range(fields_per_collection)
+                        ],
+                    }
+                    for collection in range(collection_count)
+                ],
+            }
+        ]
+    }
+
+
+def report(label: str, function: Callable[[], object]) -> float:
+    """Time `function` over a few rounds and print the average."""
+    seconds = timeit(function, number=ROUNDS) / ROUNDS
+    print(f"  {label:<40} {seconds:9.4f}s")
+    return seconds
+
+
+def benchmark_yaml_backends(manifest_path: str) -> None:
+    """
+    Compare the pure-Python and libyaml loaders and dumpers.
+    """
+    print(f"YAML backends (active: {manifests.YAML_BACKEND})")
+    with open(manifest_path, "r", encoding="utf-8") as manifest_file:
+        raw_manifest = manifest_file.read()
+    loaded = yaml.safe_load(raw_manifest)
+
+    python_load = report("load (python)", lambda: yaml.safe_load(raw_manifest))
+    python_dump = report(
+        "dump (python)", lambda: yaml.dump(loaded, sort_keys=False, indent=2)
+    )
+    if not yaml.__with_libyaml__:
+        print("  PyYAML was built without libyaml, skipping the libyaml backend.")
+        return
+
+    libyaml_load = report(
+        "load (libyaml)", lambda: yaml.load(raw_manifest, Loader=yaml.CSafeLoader)
+    )
+    libyaml_dump = report(
+        "dump (libyaml)",
+        lambda: yaml.dump(loaded, Dumper=yaml.CDumper, sort_keys=False, indent=2),
+    )
+    print(f"  load speedup: {python_load / libyaml_load:.1f}x")
+    print(f"  dump speedup: {python_dump / libyaml_dump:.1f}x")
+
+
+def benchmark_source_locations(manifest_path: str) -> None:
+    """
+    Measure the overhead of capturing source locations while loading.
+    """
+    print("Source location tracking")
+    plain_load = report(
+        "load_yaml_into_dict", lambda: manifests.load_yaml_into_dict(manifest_path)
+    )
+    located_load = report(
+        "load_yaml_with_locations",
+        lambda: manifests.load_yaml_with_locations(manifest_path),
+    )
+    print(f"  overhead: {(located_load / plain_load - 1) * 100:.1f}%")
+
+
+def benchmark_taxonomy_bundle(manifest_path: str, bundle_path: str) -> None:
+    """
+    Compare parsing a Taxonomy from its manifest against loading a compiled bundle.
+    """
+    print("Taxonomy cold start")
+    raw_manifest = manifests.load_manifest_into_dict(manifest_path)
+    taxonomy = load_manifests_into_taxonomy(raw_manifest)
+    bundle.compile_taxonomy(taxonomy, bundle_path)
+
+    manifest_load = report(
+        "load + validate manifest",
+        lambda: load_manifests_into_taxonomy(
+            manifests.load_manifest_into_dict(manifest_path)
+        ),
+    )
+    bundle_load = report(
+        "load compiled bundle", lambda: bundle.load_taxonomy_bundle(bundle_path)
+    )
+    print(f"  speedup: {manifest_load / bundle_load:.1f}x")
+
+
+def benchmark_taxonomy_assembly(dataset_count: int = 200) -> None:
+    """
+    Compare re-validating already-parsed models into a Taxonomy against
+    assembling it without validation, for a tree of many datasets.
+    """
+    print(f"Taxonomy assembly ({dataset_count} datasets)")
+    dataset = build_dataset_manifest(collection_count=5)["dataset"][0]
+    parsed_manifests = {
+        "dataset": [
+            model_map["dataset"].parse_obj({**dataset, "fides_key": f"dataset_{index}"})
+            for index in range(dataset_count)
+        ]
+    }
+
+    parse_obj = report(
+        "Taxonomy.parse_obj", lambda: Taxonomy.parse_obj(parsed_manifests)
+    )
+    construct = report("build_taxonomy", lambda: build_taxonomy(parsed_manifests))
+    print(f"  speedup: {parse_obj / construct:.1f}x")
+
+
+def benchmark_parallel_parsing(dataset_count: int = 40) -> None:
+    """
+    Compare validating a tree of many datasets serially and across processes.
+    """
+    print(f"Parallel parsing ({dataset_count} datasets, {os.cpu_count()} CPUs)")
+    dataset = build_dataset_manifest(collection_count=5)["dataset"][0]
+    raw_manifests = {
+        "dataset": [
+            {**dataset, "fides_key": f"dataset_{index}"}
+            for index in range(dataset_count)
+        ]
+    }
+
+    serial = report("serial", lambda: load_manifests_into_taxonomy(raw_manifests))
+    parallel = report(
+        "parallel",
+        lambda: load_manifests_into_taxonomy(raw_manifests, parallel=True),
+    )
+    print(f"  speedup: {serial / parallel:.1f}x")
+
+
+def benchmark_structural_parsing(manifest_path: str) -> None:
+    """
+    Compare a full parse of the manifest against a structural-only parse.
+    """
+    print("Structural parsing")
+    raw_manifest = manifests.load_manifest_into_dict(manifest_path)
+
+    full = report("full validation", lambda: load_manifests_into_taxonomy(raw_manifest))
+    structural = report(
+        "structural",
+        lambda: load_manifests_into_taxonomy(raw_manifest, structural=True),
+    )
+    print(f"  speedup: {full / structural:.1f}x")
+
+
+def benchmark_referenced_keys() -> None:
+    """
+    Time finding every FidesKey referenced by the generated dataset.
+    """
+    print("Referenced fides_keys")
+    dataset = model_map["dataset"].parse_obj(build_dataset_manifest()["dataset"][0])
+    report(
+        "find_referenced_fides_keys",
+        lambda: relationships.find_referenced_fides_keys(dataset),
+    )
+
+
+if __name__ == "__main__":
+    with tempfile.TemporaryDirectory() as temp_dir:
+        manifest_path = f"{temp_dir}/benchmark_dataset.yml"
+        print(
+            f"> Writing a dataset with {COLLECTION_COUNT * FIELDS_PER_COLLECTION} fields..."
+        )
+        manifests.write_manifest(
+            manifest_path, build_dataset_manifest()["dataset"], "dataset"
+        )
+        print("*" * 40)
+
+        benchmark_yaml_backends(manifest_path)
+        print("*" * 40)
+
+        benchmark_source_locations(manifest_path)
+        print("*" * 40)
+
+        benchmark_taxonomy_bundle(manifest_path, f"{temp_dir}/benchmark.bundle")
+        print("*" * 40)
+
+        benchmark_taxonomy_assembly()
+        print("*" * 40)
+
+        benchmark_parallel_parsing()
+        print("*" * 40)
+
+        benchmark_structural_parsing(manifest_path)
+        print("*" * 40)
+
+        benchmark_referenced_keys()
+        print("*" * 40)
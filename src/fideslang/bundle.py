@@ -0,0 +1,412 @@
+"""
+This module handles compiling a validated Taxonomy into binary formats that
+are fast to load:
+
+- A versioned bundle, which is loaded again without re-running any
+  validation. Bundles are pickle-based, so only load them from a trusted
+  source.
+- A read-only, memory-mapped index of the taxonomy's keys, parent links and
+  attributes, which worker processes can share through the page cache.
+"""
+import json
+import mmap
+import pickle
+import struct
+import sys
+from array import array
+from bisect import bisect_left
+from typing import Dict, Iterator, List, NamedTuple, Optional, Tuple
+
+from fideslang._version import __version__
+from fideslang.manifest_io import atomic_write
+from fideslang.models import FidesModel, Taxonomy
+
+BUNDLE_MAGIC = b"FIDESBDL"
+BUNDLE_FORMAT_VERSION = 1
+_HEADER = struct.Struct(">8sHH")
+
+MAPPED_MAGIC = b"FIDESMAP"
+MAPPED_FORMAT_VERSION = 1
+_MAPPED_HEADER = struct.Struct(">8sHI")
+_MAPPED_SECTIONS = (
+    ("key_offsets", "I"),
+    ("keys", "B"),
+    ("resource_types", "B"),
+    ("parents", "i"),
+    ("child_offsets", "I"),
+    ("children", "I"),
+    ("attribute_offsets", "Q"),
+    ("attributes", "B"),
+)
+
+
+class TaxonomyBundleError(ValueError):
+    """Raised when a taxonomy bundle can't be loaded."""
+
+
+def compile_taxonomy(taxonomy: Taxonomy, file_path: str) -> None:
+    """
+    Serialize an already-validated Taxonomy into a binary bundle.
+
+    The bundle is written atomically, so a reader never sees a partially
+    written bundle.
+    """
+    fideslang_version = __version__.encode("utf-8")
+    with atomic_write(file_path, "wb") as bundle_file:
+        bundle_file.write(
+            _HEADER.pack(BUNDLE_MAGIC, BUNDLE_FORMAT_VERSION, len(fideslang_version))
+        )
+        bundle_file.write(fideslang_version)
+        pickle.dump(taxonomy, bundle_file, protocol=pickle.HIGHEST_PROTOCOL)
+
+
+def load_taxonomy_bundle(file_path: str) -> Taxonomy:
+    """
+    Load a Taxonomy from a bundle written by `compile_taxonomy`.
+
+    The models are restored as they were compiled, without re-validating them.
+    Bundles written by a different bundle format or fideslang version are
+    rejected, as the models they contain may no longer match.
+    """
+    with open(file_path, "rb") as bundle_file:
+        header = bundle_file.read(_HEADER.size)
+        if len(header) != _HEADER.size:
+            raise TaxonomyBundleError(f"Invalid taxonomy bundle: {file_path}")
+
+        magic, format_version, version_length = _HEADER.unpack(header)
+        if magic != BUNDLE_MAGIC:
+            raise TaxonomyBundleError(f"Invalid taxonomy bundle: {file_path}")
+        if format_version != BUNDLE_FORMAT_VERSION:
+            raise TaxonomyBundleError(
+                f"Unsupported taxonomy bundle format {format_version}, expected {BUNDLE_FORMAT_VERSION}: {file_path}"
+            )
+
+        fideslang_version = bundle_file.read(version_length).decode("utf-8")
+        if fideslang_version != __version__:
+            raise TaxonomyBundleError(
+                f"Taxonomy bundle was compiled with fideslang {fideslang_version}, but {__version__} is installed: {file_path}"
+            )
+
+        taxonomy = pickle.load(bundle_file)
+
+    if not isinstance(taxonomy, Taxonomy):
+        raise TaxonomyBundleError(f"Invalid taxonomy bundle: {file_path}")
+    return taxonomy
+
+
+def _sort_mapped_entries(
+    taxonomy: Taxonomy, resource_types: List[str]
+) -> List[Tuple[bytes, int, FidesModel]]:
+    return sorted(
+        (
+            (resource.fides_key.encode("utf-8"), type_index, resource)
+            for type_index, resource_type in enumerate(resource_types)
+            for resource in getattr(taxonomy, resource_type) or []
+        ),
+        key=lambda entry: (entry[0], entry[1]),
+    )
+
+
+def _get_parent_position(
+    resource: FidesModel, type_index: int, positions: Dict[Tuple[bytes, int], int]
+) -> int:
+    """The position of a resource's parent of the same type, or -1 if it has none."""
+    parent_key = getattr(resource, "parent_key", None)
+    if not parent_key:
+        return -1
+    return positions.get((parent_key.encode("utf-8"), type_index), -1)
+
+
+def _build_mapped_sections(taxonomy: Taxonomy) -> Tuple[List[str], Dict[str, array]]:
+    """
+    Flatten a Taxonomy into the typed arrays stored in a mapped taxonomy.
+
+    Resources are sorted by `(fides_key, resource_type)`, so that a key can be
+    found with a binary search and every array is indexed by that position.
+    """
+    resource_types = sorted(taxonomy.__fields__)
+    entries = _sort_mapped_entries(taxonomy, resource_types)
+    positions = {(entry[0], entry[1]): index for index, entry in enumerate(entries)}
+
+    sections = {name: array(typecode) for name, typecode in _MAPPED_SECTIONS}
+    child_lists: List[List[int]] = [[] for _ in entries]
+    sections["key_offsets"].append(0)
+    sections["attribute_offsets"].append(0)
+    for index, (key, type_index, resource) in enumerate(entries):
+        sections["keys"].frombytes(key)
+        sections["key_offsets"].append(len(sections["keys"]))
+        sections["resource_types"].append(type_index)
+
+        parent = _get_parent_position(resource, type_index, positions)
+        sections["parents"].append(parent)
+        if parent >= 0:
+            child_lists[parent].append(index)
+
+        sections["attributes"].frombytes(resource.json().encode("utf-8"))
+        sections["attribute_offsets"].append(len(sections["attributes"]))
+
+    sections["child_offsets"].append(0)
+    for child_list in child_lists:
+        sections["children"].extend(child_list)
+        sections["child_offsets"].append(len(sections["children"]))
+    return resource_types, sections
+
+
+def compile_mapped_taxonomy(taxonomy: Taxonomy, file_path: str) -> None:
+    """
+    Write a Taxonomy out as a flat, memory-mappable file for `MappedTaxonomy`.
+    """
+    resource_types, sections = _build_mapped_sections(taxonomy)
+
+    # Every section starts on an 8-byte boundary so that it can be cast in place
+    offset = 0
+    layout: Dict[str, Tuple[int, int]] = {}
+    for name, _ in _MAPPED_SECTIONS:
+        offset += -offset % 8
+        layout[name] = (offset, len(sections[name]))
+        offset += len(sections[name]) * sections[name].itemsize
+
+    metadata = json.dumps(
+        {
+            "fideslang_version": __version__,
+            "byteorder": sys.byteorder,
+            "itemsizes": {name: sections[name].itemsize for name in sections},
+            "resource_types": resource_types,
+            "layout": layout,
+        }
+    ).encode("utf-8")
+    body_start = _MAPPED_HEADER.size + len(metadata)
+    body_start += -body_start % 8
+
+    with atomic_write(file_path, "wb") as mapped_file:
+        mapped_file.write(
+            _MAPPED_HEADER.pack(MAPPED_MAGIC, MAPPED_FORMAT_VERSION, len(metadata))
+        )
+        mapped_file.write(metadata)
+        for name, _ in _MAPPED_SECTIONS:
+            mapped_file.seek(body_start + layout[name][0])
+            sections[name].tofile(mapped_file)
+        mapped_file.truncate(body_start + offset)
+
+
+class _MappedSections(NamedTuple):
+    """The typed views over each section of a mapped taxonomy."""
+
+    key_offsets: memoryview
+    keys: memoryview
+    resource_types: memoryview
+    parents: memoryview
+    child_offsets: memoryview
+    children: memoryview
+    attribute_offsets: memoryview
+    attributes: memoryview
+
+
+def _read_mapped_metadata(buffer: mmap.mmap, file_path: str) -> Tuple[Dict, int]:
+    """
+    Read and check the header and metadata of a mapped taxonomy, returning the
+    metadata and the offset its sections start at.
+    """
+    try:
+        magic, format_version, metadata_length = _MAPPED_HEADER.unpack_from(buffer)
+        metadata = json.loads(
+            buffer[_MAPPED_HEADER.size : _MAPPED_HEADER.size + metadata_length]
+        )
+    except (struct.error, ValueError):
+        raise TaxonomyBundleError(f"Invalid mapped taxonomy: {file_path}")
+    if (
+        magic != MAPPED_MAGIC
+        or format_version != MAPPED_FORMAT_VERSION
+        or not isinstance(metadata, dict)
+        or not isinstance(metadata.get("resource_types"), list)
+    ):
+        raise TaxonomyBundleError(f"Invalid mapped taxonomy: {file_path}")
+
+    fideslang_version = metadata.get("fideslang_version")
+    if fideslang_version != __version__:
+        raise TaxonomyBundleError(
+            f"Mapped taxonomy was compiled with fideslang {fideslang_version}, but {__version__} is installed: {file_path}"
+        )
+    if metadata.get("byteorder") != sys.byteorder or metadata.get("itemsizes") != {
+        name: array(typecode).itemsize for name, typecode in _MAPPED_SECTIONS
+    }:
+        raise TaxonomyBundleError(
+            f"Mapped taxonomy was compiled on an incompatible platform: {file_path}"
+        )
+
+    body_start = _MAPPED_HEADER.size + metadata_length
+    return metadata, body_start + -body_start % 8
+
+
+def _get_section_bounds(
+    metadata: Dict, body_start: int, file_size: int, file_path: str
+) -> Dict[str, Tuple[int, int]]:
+    """Work out where each section starts and ends, checking it's within the file."""
+    bounds = {}
+    for name, _ in _MAPPED_SECTIONS:
+        try:
+            offset, length = metadata["layout"][name]
+        except (KeyError, TypeError, ValueError):
+            offset = length = None
+        if not (isinstance(offset, int) and isinstance(length, int)):
+            raise TaxonomyBundleError(f"Invalid mapped taxonomy: {file_path}")
+
+        start = body_start + offset
+        end = start + length * metadata["itemsizes"][name]
+        if not body_start <= start <= end <= file_size:
+            raise TaxonomyBundleError(f"Invalid mapped taxonomy: {file_path}")
+        bounds[name] = (start, end)
+    return bounds
+
+
+class MappedTaxonomy:
+    """
+    A read-only view of a taxonomy written by `compile_mapped_taxonomy`.
+
+    The file is memory-mapped and queried in place, so no per-process
+    pydantic models are built and every process mapping the same file shares
+    its pages through the page cache. A `fides_key` can exist once per
+    resource type, so lookups accept an optional `resource_type` to pick one.
+
+    Files that aren't valid mapped taxonomies, or that were compiled by a
+    different fideslang version or on an incompatible platform, raise a
+    `TaxonomyBundleError`.
+    """
+
+    def __init__(self, file_path: str) -> None:
+        with open(file_path, "rb") as mapped_file:
+            try:
+                self._mmap = mmap.mmap(mapped_file.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:  # Empty files can't be mapped
+                raise TaxonomyBundleError(f"Invalid mapped taxonomy: {file_path}")
+
+        try:
+            metadata, body_start = _read_mapped_metadata(self._mmap, file_path)
+            bounds = _get_section_bounds(
+                metadata, body_start, len(self._mmap), file_path
+            )
+        except TaxonomyBundleError:
+            self._mmap.close()
+            raise
+
+        self.resource_types: List[str] = metadata["resource_types"]
+        buffer = memoryview(self._mmap)
+        self._sections = _MappedSections(
+            **{
+                name: buffer[bounds[name][0] : bounds[name][1]].cast(typecode)
+                for name, typecode in _MAPPED_SECTIONS
+            }
+        )
+        self._views = [buffer, *self._sections]
+
+    def close(self) -> None:
+        """Release the memory map."""
+        for view in reversed(self._views):
+            view.release()
+        self._views = []
+        self._mmap.close()
+
+    def __enter__(self) -> "MappedTaxonomy":
+        return self
+
+    def __exit__(self, *args: object) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return len(self._sections.resource_types)
+
+    def __contains__(self, fides_key: str) -> bool:
+        return self._find(fides_key) is not None
+
+    def _key(self, index: int) -> str:
+        return (
+            self._sections.keys[
+                self._sections.key_offsets[index] : self._sections.key_offsets[
+                    index + 1
+                ]
+            ]
+            .tobytes()
+            .decode("utf-8")
+        )
+
+    def _find(
+        self, fides_key: str, resource_type: Optional[str] = None
+    ) -> Optional[int]:
+        """Binary search for the position of a key, optionally of a given type."""
+        index = bisect_left(_KeySequence(self), fides_key)
+        while index < len(self) and self._key(index) == fides_key:
+            if resource_type in (
+                None,
+                self.resource_types[self._sections.resource_types[index]],
+            ):
+                return index
+            index += 1
+        return None
+
+    def keys(self) -> Iterator[str]:
+        """Iterate over every fides_key, in sorted order."""
+        return (self._key(index) for index in range(len(self)))
+
+    def get_resource_types(self, fides_key: str) -> List[str]:
+        """Return the resource types that define the given fides_key."""
+        index = self._find(fides_key)
+        resource_types = []
+        while index is not None and index < len(self) and self._key(index) == fides_key:
+            resource_types.append(
+                self.resource_types[self._sections.resource_types[index]]
+            )
+            index += 1
+        return resource_types
+
+    def get_attributes(
+        self, fides_key: str, resource_type: Optional[str] = None
+    ) -> Optional[Dict]:
+        """Return the attributes of a resource as a dictionary."""
+        index = self._find(fides_key, resource_type)
+        if index is None:
+            return None
+        return json.loads(
+            self._sections.attributes[
+                self._sections.attribute_offsets[
+                    index
+                ] : self._sections.attribute_offsets[index + 1]
+            ].tobytes()
+        )
+
+    def get_parent(
+        self, fides_key: str, resource_type: Optional[str] = None
+    ) -> Optional[str]:
+        """Return the key of a resource's parent, if it is in the taxonomy."""
+        index = self._find(fides_key, resource_type)
+        if index is None or self._sections.parents[index] < 0:
+            return None
+        return self._key(self._sections.parents[index])
+
+    def get_children(
+        self, fides_key: str, resource_type: Optional[str] = None
+    ) -> List[str]:
+        """Return the keys of a resource's direct children."""
+        index = self._find(fides_key, resource_type)
+        if index is None:
+            return []
+        return [
+            self._key(child)
+            for child in self._sections.children[
+                self._sections.child_offsets[index] : self._sections.child_offsets[
+                    index + 1
+                ]
+            ]
+        ]
+
+
+class _KeySequence:
+    """Expose the sorted keys of a MappedTaxonomy as a sequence for bisect."""
+
+    def __init__(self, mapped_taxonomy: MappedTaxonomy) -> None:
+        self.mapped_taxonomy = mapped_taxonomy
+
+    def __len__(self) -> int:
+        return len(self.mapped_taxonomy)
+
+    def __getitem__(self, index: int) -> str:
+        return self.mapped_taxonomy._key(index)  # pylint: disable=protected-access
@@ -0,0 +1,71 @@
+"""
+An on-disk cache of parsed manifest files, used by `ingest_manifests` when it
+is given a `cache_dir`.
+"""
+import hashlib
+import os
+import marshal
+import shutil
+from typing import Callable, Dict
+
+from fideslang._version import __version__
+from fideslang.manifest_io import atomic_write
+
+CACHE_DIR_NAME = "fideslang-cache"
+
+
+def get_cache_version_dir(cache_dir: str) -> str:
+    """
+    Return the cache subdirectory for the running fideslang version, evicting
+    any entries written by other versions.
+
+    Entries are kept under a `fideslang-cache` directory within `cache_dir`,
+    and only that directory is ever evicted from, so `cache_dir` can safely
+    be shared with anything else.
+    """
+    cache_root = os.path.join(cache_dir, CACHE_DIR_NAME)
+    for entry in os.scandir(cache_root) if os.path.isdir(cache_root) else []:
+        if entry.is_dir() and entry.name != __version__:
+            shutil.rmtree(entry.path, ignore_errors=True)
+
+    version_dir = os.path.join(cache_root, __version__)
+    os.makedirs(version_dir, exist_ok=True)
+    return version_dir
+
+
+def load_cached_manifest_into_dict(
+    file_path: str, cache_dir: str, load_manifest: Callable[[str], Dict]
+) -> Dict:
+    """
+    Load a manifest file into a dictionary with `load_manifest`, through an
+    on-disk cache.
+
+    Each file has one entry, keyed by its absolute path and holding the
+    modification time and size it was parsed at, so unchanged files skip
+    yaml parsing entirely and changed files overwrite their entry. Entries
+    are stored with `marshal`, which only reads back plain data and never
+    runs code. `cache_dir` is expected to be the version directory returned
+    by `get_cache_version_dir`.
+    """
+    file_stat = os.stat(file_path)
+    file_version = (file_stat.st_mtime_ns, file_stat.st_size)
+    cache_key = hashlib.sha256(os.path.abspath(file_path).encode()).hexdigest()
+    cache_path = os.path.join(cache_dir, f"{cache_key}.marshal")
+
+    try:
+        with open(cache_path, "rb") as cache_file:
+            cached_version, cached_manifest = marshal.load(cache_file)
+        if cached_version == file_version:
+            return cached_manifest
+    except (OSError, EOFError, TypeError, ValueError):
+        pass
+
+    loaded = load_manifest(file_path)
+    try:
+        serialized = marshal.dumps((file_version, loaded))
+    except ValueError:
+        # Values such as yaml timestamps can't be marshalled, so aren't cached
+        return loaded
+    with atomic_write(cache_path, "wb") as cache_file:
+        cache_file.write(serialized)
+    return loaded
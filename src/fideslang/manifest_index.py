@@ -0,0 +1,372 @@
+"""
+A lazy index over a manifest tree, for loading and validating single resources
+without ingesting the whole tree.
+"""
+import json
+import os
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+import yaml
+
+from fideslang._version import __version__
+from fideslang.manifest_io import atomic_write, get_compression
+from fideslang.manifests import (
+    SourceLocation,
+    get_manifest_extension,
+    get_manifest_list,
+    ingest_manifests_with_locations,
+    load_manifest_into_dict,
+)
+from fideslang.models import FidesModel, Taxonomy
+from fideslang.parse import load_manifests_into_taxonomy, parse_dict
+
+try:
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:  # pragma: no cover
+    from yaml import SafeLoader  # type: ignore[assignment]
+
+
+class ManifestIndexEntry(NamedTuple):
+    """
+    Where a single resource is defined in a manifest tree.
+
+    `position` is the resource's index within its type in the file. For
+    uncompressed yaml files, `start` and `end` are the byte offsets of the
+    lines spanning the resource and `column` is where it starts on the
+    first of them.
+    """
+
+    resource_type: str
+    file_path: str
+    position: int
+    line: Optional[int] = None
+    start: Optional[int] = None
+    end: Optional[int] = None
+    column: int = 0
+
+
+def _get_node_fides_key(node: yaml.Node) -> Optional[str]:
+    if isinstance(node, yaml.MappingNode):
+        for key_node, value_node in node.value:
+            if key_node.value == "fides_key" and isinstance(
+                value_node, yaml.ScalarNode
+            ):
+                return value_node.value
+    return None
+
+
+def _get_byte_offsets(text: str, char_offsets: Iterable[int]) -> Dict[int, int]:
+    """Convert character offsets within `text` into utf-8 byte offsets, in one pass."""
+    byte_offsets = {}
+    previous_char_offset, byte_offset = 0, 0
+    for char_offset in sorted(set(char_offsets)):
+        byte_offset += len(text[previous_char_offset:char_offset].encode("utf-8"))
+        byte_offsets[char_offset] = byte_offset
+        previous_char_offset = char_offset
+    return byte_offsets
+
+
+def _get_line_start(node: yaml.Node) -> int:
+    """The character offset of the start of the line a node starts on."""
+    return node.start_mark.index - node.start_mark.column
+
+
+def _index_loaded_manifest(file_path: str) -> Dict[str, List[ManifestIndexEntry]]:
+    """Index a json or compressed file, locating its resources by position only."""
+    entries: Dict[str, List[ManifestIndexEntry]] = {}
+    for resource_type, value in load_manifest_into_dict(file_path).items():
+        resources = value if isinstance(value, list) else [value]
+        for position, resource in enumerate(resources):
+            if isinstance(resource, dict) and resource.get("fides_key"):
+                entries.setdefault(str(resource["fides_key"]), []).append(
+                    ManifestIndexEntry(resource_type, file_path, position)
+                )
+    return entries
+
+
+def _compose_resource_nodes(text: str) -> List[Tuple[str, int, yaml.Node]]:
+    """
+    Compose every document in a yaml manifest, without constructing it, and
+    return the type, position and node of each resource.
+    """
+    resource_nodes: List[Tuple[str, int, yaml.Node]] = []
+    positions: Dict[str, int] = {}
+    loader = SafeLoader(text)
+    try:
+        while loader.check_node():
+            node = loader.get_node()
+            for key_node, value_node in (
+                node.value if isinstance(node, yaml.MappingNode) else []
+            ):
+                resource_type = key_node.value
+                for resource_node in (
+                    value_node.value
+                    if isinstance(value_node, yaml.SequenceNode)
+                    else [value_node]
+                ):
+                    position = positions.get(resource_type, 0)
+                    positions[resource_type] = position + 1
+                    resource_nodes.append((resource_type, position, resource_node))
+    finally:
+        loader.dispose()
+    return resource_nodes
+
+
+def index_manifest_file(file_path: str) -> Dict[str, List[ManifestIndexEntry]]:
+    """
+    Record where every resource in a manifest file is, keyed by fides_key.
+
+    Uncompressed yaml files are only composed, never constructed, and each
+    resource's byte span is recorded so that it can be parsed on its own
+    later. Other files are loaded and located by position only.
+    """
+    if get_manifest_extension(file_path) == "json" or get_compression(file_path):
+        return _index_loaded_manifest(file_path)
+
+    # Line endings are kept as-is, so that character offsets into the text
+    # map onto the same bytes on disk for files with "\r\n" line endings
+    with open(file_path, "r", encoding="utf-8", newline="") as yaml_file:
+        text = yaml_file.read()
+
+    resource_nodes = [
+        (resource_type, position, resource_node)
+        for resource_type, position, resource_node in _compose_resource_nodes(text)
+        if _get_node_fides_key(resource_node)
+    ]
+    byte_offsets = _get_byte_offsets(
+        text,
+        (
+            offset
+            for _, _, resource_node in resource_nodes
+            for offset in (_get_line_start(resource_node), resource_node.end_mark.index)
+        ),
+    )
+    entries: Dict[str, List[ManifestIndexEntry]] = {}
+    for resource_type, position, resource_node in resource_nodes:
+        entries.setdefault(str(_get_node_fides_key(resource_node)), []).append(
+            ManifestIndexEntry(
+                resource_type,
+                file_path,
+                position,
+                line=resource_node.start_mark.line + 1,
+                start=byte_offsets[_get_line_start(resource_node)],
+                end=byte_offsets[resource_node.end_mark.index],
+                column=resource_node.start_mark.column,
+            )
+        )
+    return entries
+
+
+def load_manifest_index_entry(
+    entry: ManifestIndexEntry, fides_key: Optional[str] = None
+) -> Dict:
+    """
+    Load the raw resource for an index entry.
+
+    Only the resource's own bytes are read and parsed when its span is known.
+    Resources that can't be parsed on their own, such as those using an alias
+    defined elsewhere in the file, or whose span no longer holds the resource
+    for `fides_key`, fall back to loading the whole file.
+    """
+    if entry.start is not None and entry.end is not None:
+        with open(entry.file_path, "rb") as manifest_file:
+            manifest_file.seek(entry.start)
+            text = manifest_file.read(entry.end - entry.start).decode("utf-8")
+
+        # Blank out what precedes the resource on its first line, such as the
+        # "- " of its sequence item, leaving an indented resource behind
+        try:
+            resource = yaml.load(
+                " " * entry.column + text[entry.column :], Loader=SafeLoader
+            )
+            if isinstance(resource, dict) and (
+                fides_key is None or resource.get("fides_key") == fides_key
+            ):
+                return resource
+        except yaml.YAMLError:
+            pass
+
+    value = load_manifest_into_dict(entry.file_path)[entry.resource_type]
+    return (value if isinstance(value, list) else [value])[entry.position]
+
+
+class ManifestIndex:
+    """
+    A lazy index over a manifest tree, mapping each fides_key to where its
+    resource is defined.
+
+    Building the index composes every file once, without constructing or
+    validating any resources. Individual resources are then only parsed and
+    validated when they are requested, and cached from then on. Files that
+    changed since they were indexed are re-indexed on access, and the index
+    can be persisted to `index_path` so later runs only re-index the files
+    that changed.
+    """
+
+    def __init__(
+        self,
+        manifests_dir: str,
+        index_path: Optional[str] = None,
+        extensions: Optional[List[str]] = None,
+    ) -> None:
+        self.manifests_dir = manifests_dir
+        self.index_path = index_path
+        self.extensions = extensions
+        self._entries: Dict[str, List[ManifestIndexEntry]] = {}
+        self._file_stats: Dict[str, Tuple[int, int]] = {}
+        self._file_keys: Dict[str, List[str]] = {}
+        self._resources: Dict[ManifestIndexEntry, FidesModel] = {}
+
+        if index_path and os.path.isfile(index_path):
+            self._load(index_path)
+        self.refresh()
+
+    def __contains__(self, fides_key: str) -> bool:
+        return fides_key in self._entries
+
+    def __len__(self) -> int:
+        return sum(len(entries) for entries in self._entries.values())
+
+    def keys(self) -> List[str]:
+        """Every indexed fides_key, sorted."""
+        return sorted(self._entries)
+
+    def refresh(self) -> None:
+        """
+        Index any new or changed files and drop deleted ones, then persist the
+        index if it has an `index_path`.
+        """
+        file_paths = get_manifest_list(self.manifests_dir, self.extensions)
+        for file_path in set(self._file_stats).difference(file_paths):
+            self._drop_file(file_path)
+        for file_path in file_paths:
+            if self._file_stats.get(file_path) != self._get_file_stat(file_path):
+                self._index_file(file_path)
+
+        if self.index_path:
+            self._save(self.index_path)
+
+    def get_entry(
+        self, fides_key: str, resource_type: Optional[str] = None
+    ) -> Optional[ManifestIndexEntry]:
+        """
+        Return where a resource is defined, re-indexing its file if it changed
+        and dropping it if it was deleted.
+        """
+        entry = self._find_entry(fides_key, resource_type)
+        while entry:
+            try:
+                file_stat = self._get_file_stat(entry.file_path)
+            except FileNotFoundError:
+                self._drop_file(entry.file_path)
+            else:
+                if self._file_stats[entry.file_path] == file_stat:
+                    return entry
+                self._index_file(entry.file_path)
+                return self._find_entry(fides_key, resource_type)
+            entry = self._find_entry(fides_key, resource_type)
+        return None
+
+    def get_raw(
+        self, fides_key: str, resource_type: Optional[str] = None
+    ) -> Optional[Dict]:
+        """Load a single raw resource, without validating it."""
+        entry = self.get_entry(fides_key, resource_type)
+        return load_manifest_index_entry(entry, fides_key) if entry else None
+
+    def get(
+        self, fides_key: str, resource_type: Optional[str] = None
+    ) -> Optional[FidesModel]:
+        """Parse and validate a single resource, caching the result."""
+        entry = self.get_entry(fides_key, resource_type)
+        if entry is None:
+            return None
+        if entry not in self._resources:
+            self._resources[entry] = parse_dict(
+                entry.resource_type,
+                load_manifest_index_entry(entry, fides_key),
+                source_location=SourceLocation(entry.file_path, entry.line),
+            )
+        return self._resources[entry]
+
+    def validate_all(self) -> Taxonomy:
+        """Parse and validate every resource in the tree into a Taxonomy."""
+        return load_manifests_into_taxonomy(
+            *ingest_manifests_with_locations(self.manifests_dir, self.extensions)
+        )
+
+    def _find_entry(
+        self, fides_key: str, resource_type: Optional[str]
+    ) -> Optional[ManifestIndexEntry]:
+        for entry in self._entries.get(fides_key, []):
+            if resource_type in (None, entry.resource_type):
+                return entry
+        return None
+
+    @staticmethod
+    def _get_file_stat(file_path: str) -> Tuple[int, int]:
+        file_stat = os.stat(file_path)
+        return file_stat.st_mtime_ns, file_stat.st_size
+
+    def _drop_file(self, file_path: str) -> None:
+        for fides_key in self._file_keys.pop(file_path, []):
+            remaining = [
+                entry
+                for entry in self._entries.get(fides_key, [])
+                if entry.file_path != file_path
+            ]
+            if remaining:
+                self._entries[fides_key] = remaining
+            else:
+                self._entries.pop(fides_key, None)
+        self._file_stats.pop(file_path, None)
+        self._resources = {
+            entry: resource
+            for entry, resource in self._resources.items()
+            if entry.file_path != file_path
+        }
+
+    def _index_file(self, file_path: str) -> None:
+        self._drop_file(file_path)
+        self._file_stats[file_path] = self._get_file_stat(file_path)
+        file_entries = index_manifest_file(file_path)
+        self._file_keys[file_path] = list(file_entries)
+        for fides_key, entries in file_entries.items():
+            self._entries.setdefault(fides_key, []).extend(entries)
+
+    def _save(self, index_path: str) -> None:
+        with atomic_write(index_path) as index_file:
+            json.dump(
+                {
+                    "fideslang_version": __version__,
+                    "files": {
+                        file_path: [
+                            list(self._file_stats[file_path]),
+                            [
+                                [fides_key, *entry]
+                                for fides_key in self._file_keys[file_path]
+                                for entry in self._entries[fides_key]
+                                if entry.file_path == file_path
+                            ],
+                        ]
+                        for file_path in sorted(self._file_stats)
+                    },
+                },
+                index_file,
+            )
+
+    def _load(self, index_path: str) -> None:
+        with open(index_path, "r", encoding="utf-8") as index_file:
+            saved_index = json.load(index_file)
+        if saved_index.get("fideslang_version") != __version__:
+            return
+
+        for file_path, (file_stat, entries) in saved_index["files"].items():
+            self._file_stats[file_path] = (file_stat[0], file_stat[1])
+            self._file_keys[file_path] = []
+            for fides_key, *entry in entries:
+                if fides_key not in self._file_keys[file_path]:
+                    self._file_keys[file_path].append(fides_key)
+                self._entries.setdefault(fides_key, []).append(
+                    ManifestIndexEntry(*entry)
+                )
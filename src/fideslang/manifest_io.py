@@ -0,0 +1,118 @@
+"""
+Low-level reading and writing of manifest files, decompressing and
+compressing `.gz` and `.zst` files as streams and writing files atomically.
+"""
+import gzip
+import io
+import os
+import secrets
+import stat
+from contextlib import contextmanager
+from types import ModuleType
+from typing import IO, Iterator, Optional, Tuple, cast
+
+COMPRESSION_EXTENSIONS = ["gz", "zst"]
+
+
+def get_compression(file_path: str) -> Optional[str]:
+    """Return the compression extension of a file name, if it has one."""
+    extension = file_path.split(".")[-1]
+    return extension if extension in COMPRESSION_EXTENSIONS else None
+
+
+def _import_zstandard() -> ModuleType:
+    try:
+        import zstandard
+    except ImportError:
+        raise ImportError(
+            "The 'zstandard' package is required to read or write .zst manifests."
+        )
+    return zstandard
+
+
+def open_manifest(file_path: str, mode: str = "r") -> IO:
+    """
+    Open a manifest file for reading, decompressing `.gz` and `.zst` files
+    as a stream. `.zst` files require the optional `zstandard` package.
+    """
+    encoding = None if "b" in mode else "utf-8"
+    compression = get_compression(file_path)
+    if compression == "gz":
+        return cast(
+            IO, gzip.open(file_path, mode if "b" in mode else "rt", encoding=encoding)
+        )
+    if compression == "zst":
+        return _import_zstandard().open(file_path, mode, encoding=encoding)
+    return open(file_path, mode, encoding=encoding)
+
+
+@contextmanager
+def _compressed_writer(raw_file: IO, file_name: str) -> Iterator[IO]:
+    """Wrap a binary file in a streaming compressor, based on `file_name`."""
+    compression = get_compression(file_name)
+    if compression == "gz":
+        with gzip.GzipFile(fileobj=raw_file, mode="wb") as compressed_file:
+            yield cast(IO, compressed_file)
+    elif compression == "zst":
+        compressor = _import_zstandard().ZstdCompressor()
+        with compressor.stream_writer(raw_file, closefd=False) as compressed_file:
+            yield compressed_file
+    else:
+        yield raw_file
+
+
+def _create_temp_file(file_name: str) -> Tuple[int, str]:
+    """
+    Create a new hidden file next to `file_name` and return its descriptor and
+    path. The kernel applies the umask, as it does for any new file.
+    """
+    directory, base_name = os.path.split(os.path.abspath(file_name))
+    while True:
+        temp_path = os.path.join(directory, f".{base_name}.{secrets.token_hex(8)}")
+        try:
+            flags = os.O_CREAT | os.O_EXCL | os.O_WRONLY
+            return os.open(temp_path, flags, 0o666), temp_path
+        except FileExistsError:
+            continue
+
+
+def _copy_mode(file_name: str, temp_path: str) -> None:
+    """Give `temp_path` the permissions of `file_name`, if it already exists."""
+    try:
+        mode = os.stat(file_name).st_mode
+    except FileNotFoundError:
+        return
+    os.chmod(temp_path, stat.S_IMODE(mode))
+
+
+@contextmanager
+def atomic_write(
+    file_name: str, mode: str = "w", compress: bool = False
+) -> Iterator[IO]:
+    """
+    Open a temporary file next to `file_name` and rename it into place once
+    the block completes, so that an interrupted write never leaves a
+    truncated file behind. An existing file keeps its permissions.
+
+    With `compress` set, a `.gz` or `.zst` `file_name` is compressed as it is
+    written.
+    """
+    file_descriptor, temp_path = _create_temp_file(file_name)
+    try:
+        with os.fdopen(file_descriptor, "wb") as raw_file:
+            with _compressed_writer(
+                raw_file, file_name if compress else ""
+            ) as binary_file:
+                if "b" in mode:
+                    yield binary_file
+                else:
+                    text_file = io.TextIOWrapper(binary_file, encoding="utf-8")
+                    yield text_file
+                    text_file.flush()
+                    text_file.detach()
+        _copy_mode(file_name, temp_path)
+        os.replace(temp_path, file_name)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.unlink(temp_path)
+        raise
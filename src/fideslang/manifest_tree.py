@@ -0,0 +1,155 @@
+"""
+A manifest directory that is kept ingested and parsed as its files change.
+"""
+import os
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from fideslang.manifests import (
+    ALL_MANIFEST_EXTENSIONS,
+    get_manifest_list,
+    is_ignored,
+    is_manifest_file,
+    load_ignore_patterns,
+    load_manifest_into_dict,
+    union_manifests,
+)
+from fideslang.models import Taxonomy
+from fideslang.parse import build_taxonomy, load_manifests_into_taxonomy
+
+
+def _get_relative_parts(file_path: str, manifests_dir: str) -> Optional[List[str]]:
+    """
+    Return the components of `file_path` relative to `manifests_dir`, an empty
+    list if `manifests_dir` is that file itself, or None if it is outside.
+    """
+    # Compare absolute paths first, so that symlinks within the directory
+    # are kept as a full ingest finds them, then resolved paths
+    normalizers: Tuple[Callable[[str], str], ...] = (
+        os.path.abspath,
+        os.path.realpath,
+    )
+    for normalize in normalizers:
+        normalized_path = normalize(file_path)
+        normalized_dir = normalize(manifests_dir)
+        if not os.path.isdir(normalized_dir):
+            if normalized_path == normalized_dir:
+                return []
+            continue
+        parts = os.path.relpath(normalized_path, normalized_dir).split(os.sep)
+        if parts[0] != os.pardir:
+            return parts
+    return None
+
+
+class ManifestTree:
+    """
+    An ingested manifest directory that can be kept up to date incrementally.
+
+    The contribution of every file is remembered, so `update` only re-reads
+    and re-parses the files that changed, were added or were deleted. The
+    unioned manifests and the `Taxonomy` are rebuilt from the stored
+    contributions the next time they are requested.
+    """
+
+    def __init__(
+        self, manifests_dir: str, extensions: Optional[List[str]] = None
+    ) -> None:
+        self.manifests_dir = manifests_dir
+        self.extensions = extensions
+        self._raw_manifests: Dict[str, Dict] = {}
+        self._parsed_manifests: Dict[str, Taxonomy] = {}
+        self._manifests: Optional[Dict[str, List[Dict]]] = None
+        self._taxonomy: Optional[Taxonomy] = None
+        self.update(get_manifest_list(manifests_dir, extensions))
+
+    def update(self, file_paths: Iterable[str]) -> None:
+        """
+        Refresh the given changed, added or deleted files.
+
+        Files that still exist are re-read and files that no longer exist are
+        dropped. Paths are normalized against `manifests_dir`, and paths that
+        a full ingest wouldn't pick up, because they are outside the directory,
+        hidden, matched by `.fidesignore` or not manifest files, are ignored.
+        """
+        ignore_patterns = load_ignore_patterns(self.manifests_dir)
+        for changed_path in file_paths:
+            file_path = self._normalize_path(changed_path, ignore_patterns)
+            if file_path is None:
+                continue
+
+            self._parsed_manifests.pop(file_path, None)
+            if os.path.isfile(file_path):
+                self._raw_manifests[file_path] = load_manifest_into_dict(file_path)
+            else:
+                self._raw_manifests.pop(file_path, None)
+
+            self._manifests = None
+            self._taxonomy = None
+
+    def _normalize_path(
+        self, file_path: str, ignore_patterns: List[str]
+    ) -> Optional[str]:
+        """
+        Return a file's path in the form a full ingest of `manifests_dir` uses,
+        or None if a full ingest would skip it.
+        """
+        parts = _get_relative_parts(file_path, self.manifests_dir)
+        if parts is None:
+            return None
+        # A single manifest file is loaded whatever `extensions` are given
+        extensions = self.extensions if parts else ALL_MANIFEST_EXTENSIONS
+        if not is_manifest_file(file_path, extensions):
+            return None
+        if any(part.startswith(".") for part in parts):
+            return None
+        for depth in range(1, len(parts) + 1):
+            if is_ignored("/".join(parts[:depth]), depth < len(parts), ignore_patterns):
+                return None
+        return os.path.join(self.manifests_dir, *parts)
+
+    @property
+    def file_paths(self) -> List[str]:
+        """The manifest files currently contributing to the tree, sorted by path."""
+        return sorted(self._raw_manifests)
+
+    @property
+    def manifests(self) -> Dict[str, List[Dict]]:
+        """The unioned raw manifests, as returned by `ingest_manifests`."""
+        if self._manifests is None:
+            self._manifests = union_manifests(
+                self._raw_manifests[file_path] for file_path in self.file_paths
+            )
+        return self._manifests
+
+    @property
+    def taxonomy(self) -> Taxonomy:
+        """
+        The parsed `Taxonomy`, only re-parsing the files that have changed.
+        """
+        if self._taxonomy is None:
+            parsed_manifests = []
+            for file_path in self.file_paths:
+                if file_path not in self._parsed_manifests:
+                    self._parsed_manifests[file_path] = load_manifests_into_taxonomy(
+                        self._raw_manifests[file_path]
+                    )
+                parsed_manifests.append(self._parsed_manifests[file_path])
+
+            resource_types = sorted(
+                {
+                    resource_type
+                    for parsed_manifest in parsed_manifests
+                    for resource_type in parsed_manifest.__fields_set__
+                }
+            )
+            self._taxonomy = build_taxonomy(
+                {
+                    resource_type: [
+                        resource
+                        for parsed_manifest in parsed_manifests
+                        for resource in getattr(parsed_manifest, resource_type)
+                    ]
+                    for resource_type in resource_types
+                }
+            )
+        return self._taxonomy
@@ -1,39 +1,403 @@
 """This module handles anything related to working with raw manifest files."""
-import glob
-from functools import reduce
-from typing import Dict, List, Set, Union
+import asyncio
+import json
+import os
+from concurrent.futures import Executor, ProcessPoolExecutor
+from fnmatch import fnmatchcase
+from functools import partial
+from typing import (
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Tuple,
+    Union,
+)
 
 import yaml
 
+from fideslang.manifest_cache import (
+    get_cache_version_dir,
+    load_cached_manifest_into_dict,
+)
+from fideslang.manifest_io import (
+    COMPRESSION_EXTENSIONS,
+    atomic_write,
+    get_compression,
+    open_manifest,
+)
+from fideslang.parse import get_chunksize
+
+try:
+    from yaml import CDumper as Dumper
+    from yaml import CSafeLoader as SafeLoader
+
+    YAML_BACKEND = "libyaml"
+except ImportError:  # pragma: no cover
+    from yaml import Dumper, SafeLoader  # type: ignore[assignment]
+
+    YAML_BACKEND = "python"
+
+try:
+    import orjson
+
+    JSON_BACKEND = "orjson"
+except ImportError:  # pragma: no cover
+    JSON_BACKEND = "json"
+
+# Manifests are discovered as yaml by default; json is opt-in through the
+# `extensions` arguments, as directories commonly hold unrelated json files
+MANIFEST_EXTENSIONS = ["yml", "yaml"]
+ALL_MANIFEST_EXTENSIONS = ["yml", "yaml", "json"]
+IGNORE_FILE_NAME = ".fidesignore"
+
+
+class SourceLocation(NamedTuple):
+    """Where a resource is defined. `line` is 1-based and unknown for json."""
+
+    file_path: str
+    line: Optional[int] = None
+
+    def __str__(self) -> str:
+        return f"{self.file_path}:{self.line}" if self.line else self.file_path
+
+
+def get_manifest_extension(file_path: str) -> str:
+    """
+    Return the format extension of a file, ignoring any compression extension.
+    For example, both `system.yml` and `system.yml.gz` return `yml`.
+    """
+    extensions = file_path.rsplit("/", 1)[-1].split(".")
+    if len(extensions) > 2 and extensions[-1] in COMPRESSION_EXTENSIONS:
+        return extensions[-2]
+    return extensions[-1]
+
+
+def is_manifest_file(file_path: str, extensions: Optional[List[str]] = None) -> bool:
+    """
+    Check whether a path names a, possibly compressed, manifest file with one
+    of the given `extensions`, which default to `MANIFEST_EXTENSIONS`.
+    """
+    return get_manifest_extension(file_path) in (extensions or MANIFEST_EXTENSIONS)
+
+
+def _is_single_manifest(manifests_dir: str) -> bool:
+    """
+    Check whether `manifests_dir` names a single manifest file. An explicit
+    file is loaded based on its own extension, so `extensions` only limit
+    which files are discovered within a directory.
+    """
+    return is_manifest_file(manifests_dir, ALL_MANIFEST_EXTENSIONS)
+
+
+class _ManifestDumper(Dumper):  # pylint: disable=too-many-ancestors
+    """
+    A Dumper that writes shared objects out in full, as resources are dumped
+    one at a time and anchors can't be referenced across separate dumps.
+    """
+
+    def ignore_aliases(self, data: object) -> bool:
+        return True
+
 
 def write_manifest(
-    file_name: str, manifest: Union[List, Dict], resource_type: str
+    file_name: str, manifest: Union[Iterable[Dict], Dict], resource_type: str
 ) -> None:
     """
     Write a dict representation of a resource out to a file.
+
+    Resources are rendered one at a time, so `manifest` can be any iterable,
+    and the file is written atomically. File names ending in `.gz` or `.zst`
+    are compressed as they are written.
+    """
+    resources = iter([manifest] if isinstance(manifest, dict) else manifest)
+    first_resource = next(resources, None)
+
+    with atomic_write(file_name, compress=True) as manifest_file:
+        yaml.dump(
+            {resource_type: [] if first_resource is None else [first_resource]},
+            manifest_file,
+            Dumper=_ManifestDumper,
+            sort_keys=False,
+            indent=2,
+        )
+        # Sequences under a mapping key aren't indented, so each following
+        # resource renders exactly as it would inside the full list
+        for resource in resources:
+            yaml.dump(
+                [resource],
+                manifest_file,
+                Dumper=_ManifestDumper,
+                sort_keys=False,
+                indent=2,
+            )
+
+
+def _get_shard_names(file_name: str, shards: int) -> List[str]:
+    """
+    Number `shards` file names after `file_name`, keeping any compression
+    extension last so that the shards are compressed the same way.
+    """
+    compression = get_compression(file_name)
+    if compression:
+        file_name = file_name[: -len(compression) - 1]
+        compression_suffix = f".{compression}"
+    else:
+        compression_suffix = ""
+    root, extension = os.path.splitext(file_name)
+    width = len(str(shards - 1))
+    return [
+        f"{root}.{index:0{width}d}{extension}{compression_suffix}"
+        for index in range(shards)
+    ]
+
+
+def write_manifest_shards(
+    file_name: str,
+    manifest: List[Dict],
+    resource_type: str,
+    shards: int,
+    parallel: bool = False,
+    max_workers: Optional[int] = None,
+) -> List[str]:
+    """
+    Split the resources across `shards` files named after `file_name`, for
+    example `systems.0.yml` and `systems.1.yml`, or `systems.0.yml.gz` for a
+    compressed `systems.yml.gz`, and return their paths.
+
+    Shards hold contiguous runs of resources and sort in order, so ingesting
+    them again preserves the original order. When `parallel` is set, the
+    shards are written across a pool of `max_workers` processes.
+    """
+    if shards < 1:
+        raise ValueError(f"shards must be at least 1, got {shards}")
+
+    shard_size = -(-len(manifest) // shards)
+    shard_names = _get_shard_names(file_name, shards)
+    shard_manifests = [
+        manifest[index * shard_size : (index + 1) * shard_size]
+        for index in range(shards)
+    ]
+
+    if parallel:
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            list(
+                executor.map(
+                    partial(write_manifest, resource_type=resource_type),
+                    shard_names,
+                    shard_manifests,
+                )
+            )
+    else:
+        for shard_name, shard_manifest in zip(shard_names, shard_manifests):
+            write_manifest(shard_name, shard_manifest, resource_type)
+    return shard_names
+
+
+def write_json_manifest(
+    file_name: str, manifest: Union[List, Dict], resource_type: str
+) -> None:
+    """
+    Write a dict representation of a resource out to a json file.
     """
     if isinstance(manifest, dict):
         manifest = {resource_type: [manifest]}
     else:
         manifest = {resource_type: manifest}
 
-    with open(file_name, "w", encoding="utf-8") as manifest_file:
-        yaml.dump(manifest, manifest_file, sort_keys=False, indent=2)
+    with atomic_write(file_name, "wb", compress=True) as manifest_file:
+        if JSON_BACKEND == "orjson":
+            manifest_file.write(orjson.dumps(manifest, option=orjson.OPT_INDENT_2))
+        else:
+            manifest_file.write(json.dumps(manifest, indent=2).encode("utf-8"))
+
+
+def load_json_into_dict(file_path: str) -> Dict:
+    """
+    This loads json files into a dictionary, using orjson when it is
+    installed, see `JSON_BACKEND`.
+    """
+    with open_manifest(file_path, "rb") as json_file:
+        if JSON_BACKEND == "orjson":
+            loaded = orjson.loads(json_file.read())
+        else:
+            loaded = json.loads(json_file.read())
+
+    if isinstance(loaded, dict):
+        return loaded
+
+    print(f"Failed to parse invalid manifest: {file_path.split('/')[-1]}. Skipping.")
+    return {}
+
+
+def load_manifest_into_dict(file_path: str) -> Dict:
+    """
+    Load a yaml or json manifest into a dictionary, based on its extension.
+    """
+    if get_manifest_extension(file_path) == "json":
+        return load_json_into_dict(file_path)
+    return load_yaml_into_dict(file_path)
 
 
 def load_yaml_into_dict(file_path: str) -> Dict:
     """
     This loads yaml files into a dictionary to be used in API calls.
+
+    The libyaml-backed loader is used whenever PyYAML was built with it,
+    see `YAML_BACKEND`. Multi-document files are unioned into a single
+    manifest.
     """
-    with open(file_path, "r", encoding="utf-8") as yaml_file:
-        loaded = yaml.safe_load(yaml_file)
-        if isinstance(loaded, dict):
-            return loaded
+    with open_manifest(file_path) as yaml_file:
+        documents = [
+            document
+            for document in yaml.load_all(yaml_file, Loader=SafeLoader)
+            if document is not None
+        ]
+
+    if documents and all(isinstance(document, dict) for document in documents):
+        return documents[0] if len(documents) == 1 else union_manifests(documents)
 
     print(f"Failed to parse invalid manifest: {file_path.split('/')[-1]}. Skipping.")
     return {}
 
 
+def load_yaml_with_locations(
+    file_path: str,
+) -> Tuple[Dict, Dict[str, List[SourceLocation]]]:
+    """
+    Load a yaml file like `load_yaml_into_dict`, along with a side table of
+    where each resource starts.
+
+    The side table has the same `{resource_type: [...]}` shape as the
+    manifest, so both can be passed through `union_manifests` and stay
+    aligned. The lines are read off the nodes the loader composes anyway, so
+    the file is only parsed once.
+    """
+    documents = []
+    with open_manifest(file_path) as yaml_file:
+        loader = SafeLoader(yaml_file)
+        try:
+            while loader.check_node():
+                node = loader.get_node()
+                document = loader.construct_document(node)
+                if document is not None:
+                    documents.append((document, get_node_locations(node, file_path)))
+        finally:
+            loader.dispose()
+
+    if documents and all(isinstance(document, dict) for document, _ in documents):
+        return (
+            union_manifests(document for document, _ in documents),
+            union_manifests(locations for _, locations in documents),
+        )
+
+    print(f"Failed to parse invalid manifest: {file_path.split('/')[-1]}. Skipping.")
+    return {}, {}
+
+
+def get_node_locations(
+    node: Optional[yaml.Node], file_path: str
+) -> Dict[str, List[SourceLocation]]:
+    """
+    Build the `{resource_type: [SourceLocation, ...]}` side table for a
+    composed top-level manifest node.
+    """
+    if not isinstance(node, yaml.MappingNode):
+        return {}
+
+    locations = {}
+    for key_node, value_node in node.value:
+        resource_nodes = (
+            value_node.value
+            if isinstance(value_node, yaml.SequenceNode)
+            else [value_node]
+        )
+        locations[key_node.value] = [
+            SourceLocation(file_path, resource_node.start_mark.line + 1)
+            for resource_node in resource_nodes
+        ]
+    return locations
+
+
+def load_manifest_with_locations(
+    file_path: str,
+) -> Tuple[Dict, Dict[str, List[SourceLocation]]]:
+    """
+    Load a yaml or json manifest along with its source location side table.
+
+    Json files are located by file only.
+    """
+    if get_manifest_extension(file_path) != "json":
+        return load_yaml_with_locations(file_path)
+
+    manifest = load_json_into_dict(file_path)
+    return manifest, {
+        resource_type: [
+            SourceLocation(file_path)
+            for _ in (value if isinstance(value, list) else [value])
+        ]
+        for resource_type, value in manifest.items()
+    }
+
+
+def iter_yaml_resources(file_path: str) -> Iterator[Tuple[str, Dict]]:
+    """
+    Stream `(resource_type, resource)` pairs out of a yaml manifest,
+    including every document of a multi-document file.
+
+    Resources are composed and constructed one at a time from the yaml event
+    stream, so only a single resource is held in memory. This relies on the
+    pure-Python composer, so it is slower than `load_yaml_into_dict` and is
+    meant for manifests too large to load at once.
+    """
+    with open_manifest(file_path) as yaml_file:
+        loader = yaml.SafeLoader(yaml_file)
+        try:
+            loader.get_event()  # StreamStartEvent
+            while loader.check_event(yaml.DocumentStartEvent):
+                loader.get_event()
+                loader.anchors = {}
+                if loader.check_event(yaml.MappingStartEvent):
+                    yield from _iter_mapping_resources(loader)
+                else:
+                    loader.compose_node(None, None)  # type: ignore[arg-type]
+                    print(
+                        f"Failed to parse invalid manifest document: {file_path.split('/')[-1]}. Skipping."
+                    )
+                loader.get_event()  # DocumentEndEvent
+        finally:
+            loader.dispose()
+
+
+def _iter_mapping_resources(loader: yaml.SafeLoader) -> Iterator[Tuple[str, Dict]]:
+    """
+    Yield the resources of a top-level `{resource_type: [...]}` mapping,
+    consuming its events from the loader.
+    """
+    loader.get_event()  # MappingStartEvent
+    while not loader.check_event(yaml.MappingEndEvent):
+        resource_type = loader.construct_document(
+            loader.compose_node(None, None)  # type: ignore[arg-type]
+        )
+        if loader.check_event(yaml.SequenceStartEvent):
+            loader.get_event()
+            while not loader.check_event(yaml.SequenceEndEvent):
+                yield resource_type, loader.construct_document(
+                    loader.compose_node(None, None)  # type: ignore[arg-type]
+                )
+            loader.get_event()  # SequenceEndEvent
+        else:
+            value = loader.construct_document(
+                loader.compose_node(None, None)  # type: ignore[arg-type]
+            )
+            for resource in value if isinstance(value, list) else [value]:
+                yield resource_type, resource
+    loader.get_event()  # MappingEndEvent
+
+
 def filter_manifest_by_type(
     manifests: Dict[str, List], filter_types: List[str]
 ) -> Dict[str, List]:
@@ -41,44 +405,238 @@ def filter_manifest_by_type(
     return {key: value for key, value in manifests.items() if key in filter_types}
 
 
-def union_manifests(manifests: List[Dict]) -> Dict[str, List[Dict]]:
+def union_manifests(manifests: Iterable[Dict]) -> Dict[str, List]:
     """
     Combine all of the manifests into a single dictionary,
     appending resource values with the same keys.
-    """
-
-    key_lists: List[List[str]] = [list(manifest.keys()) for manifest in manifests]
-    key_set: Set[str] = set(reduce(lambda x, y: [*x, *y], key_lists))
 
+    This is a single pass over the manifests, so it also accepts a lazy
+    iterator without materialising every manifest at once.
+    """
     unioned_dict: Dict[str, List] = {}
     for manifest in manifests:
-        for key in key_set:
-            if key in manifest.keys() and key in unioned_dict.keys():
-                unioned_dict[key] += manifest[key]
-            elif key in manifest.keys():
-                unioned_dict[key] = manifest[key]
+        for key, value in manifest.items():
+            resources = value if isinstance(value, list) else [value]
+            unioned_dict.setdefault(key, []).extend(resources)
     return unioned_dict
 
 
-def ingest_manifests(manifests_dir: str) -> Dict[str, List[Dict]]:
+def get_manifest_list(
+    manifests_dir: str, extensions: Optional[List[str]] = None
+) -> List[str]:
+    """
+    Return the manifest files for either a single file or a directory,
+    sorted by path. Directories will be searched recursively.
+
+    Only files with one of the given `extensions` are returned, which default
+    to the yaml `MANIFEST_EXTENSIONS`. Use `ALL_MANIFEST_EXTENSIONS` to
+    include json manifests. A single file is always returned when it is a
+    manifest of any supported type.
+    """
+    if _is_single_manifest(manifests_dir):
+        return [manifests_dir]
+
+    return list(iter_manifest_paths(manifests_dir, extensions))
+
+
+def load_ignore_patterns(manifests_dir: str) -> List[str]:
+    """
+    Load the patterns from a directory's `.fidesignore` file, if it has one.
+
+    Blank lines and lines starting with `#` are skipped.
+    """
+    ignore_path = os.path.join(manifests_dir, IGNORE_FILE_NAME)
+    if not os.path.isfile(ignore_path):
+        return []
+
+    with open(ignore_path, "r", encoding="utf-8") as ignore_file:
+        return [
+            line.strip()
+            for line in ignore_file
+            if line.strip() and not line.strip().startswith("#")
+        ]
+
+
+def is_ignored(relative_path: str, is_dir: bool, ignore_patterns: List[str]) -> bool:
+    """
+    Check a path, relative to the manifest directory, against `.fidesignore`
+    patterns.
+
+    As with `.gitignore`, a trailing `/` only matches directories, a pattern
+    containing a `/` is matched against the whole relative path and any other
+    pattern is matched against the entry's name at any depth.
+    """
+    name = relative_path.rsplit("/", 1)[-1]
+    for pattern in ignore_patterns:
+        if pattern.endswith("/"):
+            if not is_dir:
+                continue
+            pattern = pattern.rstrip("/")
+
+        if "/" in pattern:
+            if fnmatchcase(relative_path, pattern.lstrip("/")):
+                return True
+        elif fnmatchcase(name, pattern):
+            return True
+    return False
+
+
+def iter_manifest_paths(
+    manifests_dir: str, extensions: Optional[List[str]] = None
+) -> Iterator[str]:
+    """
+    Walk a directory once, yielding every manifest file in sorted path order.
+
+    Hidden files and directories are skipped, as are any entries matched by
+    the directory's `.fidesignore` file. Ignored directories are never
+    descended into.
+    """
+    ignore_patterns = load_ignore_patterns(manifests_dir)
+
+    def walk(directory: str, relative_dir: str) -> Iterator[str]:
+        try:
+            with os.scandir(directory) as scanned_entries:
+                # Sorting directories as `name/` makes this depth-first walk
+                # match the order of sorting the full paths
+                entries = sorted(
+                    (entry.name + "/" if entry.is_dir() else entry.name, entry)
+                    for entry in scanned_entries
+                    if not entry.name.startswith(".")
+                )
+        except OSError:
+            return
+
+        for sort_name, entry in entries:
+            relative_path = f"{relative_dir}{entry.name}"
+            is_dir = sort_name.endswith("/")
+            if is_ignored(relative_path, is_dir, ignore_patterns):
+                continue
+            if is_dir:
+                yield from walk(entry.path, f"{relative_path}/")
+            elif is_manifest_file(entry.name, extensions):
+                yield entry.path
+
+    yield from walk(manifests_dir, "")
+
+
+def iter_manifest_resources(
+    manifests_dir: str, stream: bool = False, extensions: Optional[List[str]] = None
+) -> Iterator[Tuple[str, Dict, str]]:
+    """
+    Lazily yield `(resource_type, resource, source_path)` for every resource
+    in either a single file or all of the manifests in a directory.
+
+    Only one manifest file is held in memory at a time, so downstream
+    parsing can start before the rest of the files have been read. With
+    `stream` set, yaml files are read through `iter_yaml_resources` so that
+    only one resource is held in memory at a time.
+    """
+    for file_path in get_manifest_list(manifests_dir, extensions):
+        if stream and get_manifest_extension(file_path) != "json":
+            for resource_type, resource in iter_yaml_resources(file_path):
+                yield resource_type, resource, file_path
+            continue
+
+        for resource_type, value in load_manifest_into_dict(file_path).items():
+            for resource in value if isinstance(value, list) else [value]:
+                yield resource_type, resource, file_path
+
+
+def ingest_manifests(
+    manifests_dir: str,
+    parallel: bool = False,
+    max_workers: Optional[int] = None,
+    cache_dir: Optional[str] = None,
+    extensions: Optional[List[str]] = None,
+) -> Dict[str, List[Dict]]:
     """
     Ingest either a single file or all of the manifests available in a
     directory and concatenate them into a single object.
 
-    Directories will be searched recursively.
+    Directories will be searched recursively. When `parallel` is set, the
+    files are parsed across a pool of `max_workers` processes and merged in
+    the same sorted path order as a serial ingest.
+
+    When a `cache_dir` is provided, parsed files are cached there and reused
+    for as long as the file is unchanged and the fideslang version matches.
+
+    Only yaml manifests are ingested from a directory unless other
+    `extensions`, such as `ALL_MANIFEST_EXTENSIONS`, are given.
     """
-    yml_endings = ["yml", "yaml"]
-    if manifests_dir.split(".")[-1] in yml_endings:
-        manifests = load_yaml_into_dict(manifests_dir)
+    load_manifest: Callable[[str], Dict] = load_manifest_into_dict
+    if cache_dir:
+        load_manifest = partial(
+            load_cached_manifest_into_dict,
+            cache_dir=get_cache_version_dir(cache_dir),
+            load_manifest=load_manifest_into_dict,
+        )
 
-    else:
-        manifest_list = []
-        for yml_ending in yml_endings:
-            manifest_list += glob.glob(
-                f"{manifests_dir}/**/*.{yml_ending}", recursive=True
+    if _is_single_manifest(manifests_dir):
+        return load_manifest(manifests_dir)
+
+    manifest_list = get_manifest_list(manifests_dir, extensions)
+    if not parallel:
+        return union_manifests(load_manifest(file) for file in manifest_list)
+
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        return union_manifests(
+            executor.map(
+                load_manifest,
+                manifest_list,
+                chunksize=get_chunksize(len(manifest_list), max_workers),
             )
+        )
+
 
-        manifests = union_manifests(
-            [load_yaml_into_dict(file) for file in manifest_list]
+def ingest_manifests_with_locations(
+    manifests_dir: str, extensions: Optional[List[str]] = None
+) -> Tuple[Dict[str, List[Dict]], Dict[str, List[SourceLocation]]]:
+    """
+    Ingest manifests like `ingest_manifests`, along with a side table holding
+    the `SourceLocation` of every resource at the same position.
+    """
+    loaded_manifests = [
+        load_manifest_with_locations(file_path)
+        for file_path in get_manifest_list(manifests_dir, extensions)
+    ]
+    return (
+        union_manifests(manifest for manifest, _ in loaded_manifests),
+        union_manifests(locations for _, locations in loaded_manifests),
+    )
+
+
+async def ingest_manifests_async(
+    manifests_dir: str,
+    max_concurrency: int = 8,
+    executor: Optional[Executor] = None,
+    extensions: Optional[List[str]] = None,
+) -> Dict[str, List[Dict]]:
+    """
+    The asyncio counterpart of `ingest_manifests`.
+
+    File discovery, reads and parsing all run in `executor`, which defaults
+    to the event loop's default executor, so the event loop is never blocked.
+    At most `max_concurrency` files are in flight at once. The result matches
+    `ingest_manifests`.
+    """
+    loop = asyncio.get_running_loop()
+    if _is_single_manifest(manifests_dir):
+        return await loop.run_in_executor(
+            executor, load_manifest_into_dict, manifests_dir
         )
-    return manifests
+
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def load_manifest(file_path: str) -> Dict:
+        async with semaphore:
+            return await loop.run_in_executor(
+                executor, load_manifest_into_dict, file_path
+            )
+
+    manifest_list = await loop.run_in_executor(
+        executor, get_manifest_list, manifests_dir, extensions
+    )
+    loaded_manifests = await asyncio.gather(
+        *(load_manifest(file_path) for file_path in manifest_list)
+    )
+    return union_manifests(loaded_manifests)
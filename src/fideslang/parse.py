@@ -1,25 +1,212 @@
 """
 This module handles everything related to parsing resources into Pydantic models,
 either from local files or the server.
+
+Resources are fully validated by default. A `structural` parse only checks
+that required fields are present, that nested models are mappings or lists
+of them and that every FidesKey is valid, without running any of the models'
+validators. It's meant for read paths that only need keys, names and
+references, and a structurally parsed resource can be fully validated later
+with `validate_resource`.
 """
-from typing import Dict, List
+import asyncio
+import os
+from concurrent.futures import Executor, ProcessPoolExecutor
+from functools import lru_cache, partial
+from typing import (
+    TYPE_CHECKING,
+    Callable,
+    Dict,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Tuple,
+    Type,
+    TypeVar,
+    Union,
+)
+
+from pydantic import BaseModel, ValidationError
+from pydantic.fields import SHAPE_LIST, SHAPE_SINGLETON
+from pydantic.validators import bool_validator, int_validator, str_validator
 
 from fideslang import FidesModel, Taxonomy, model_map
+from fideslang.models import FidesopsMetaBackwardsCompat
+from fideslang.validation import FidesKey, FidesValidationError
+
+if TYPE_CHECKING:
+    from fideslang.manifests import SourceLocation
+
+ModelT = TypeVar("ModelT", bound=BaseModel)
+
+
+class _StructuralField(NamedTuple):
+    name: str
+    required: bool
+    allow_none: bool
+    is_list: bool
+    model: Optional[Type[BaseModel]]
+    validator: Optional[Callable[[object], object]]
+
+
+def _validate_structural_key(value: object) -> str:
+    return FidesKey.validate(str_validator(value))
+
+
+# The validators pydantic coerces scalar values with, most specific type first
+_SCALAR_VALIDATORS: Tuple[Tuple[type, Callable[[object], object]], ...] = (
+    (FidesKey, _validate_structural_key),
+    (str, str_validator),
+    (bool, bool_validator),
+    (int, int_validator),
+)
+
+
+def _get_scalar_validator(type_: object) -> Optional[Callable[[object], object]]:
+    if isinstance(type_, type):
+        for scalar_type, validator in _SCALAR_VALIDATORS:
+            if issubclass(type_, scalar_type):
+                return validator
+    return None
+
+
+@lru_cache(maxsize=None)
+def _get_structural_fields(model: Type[BaseModel]) -> List[_StructuralField]:
+    """Describe the checks a structural parse makes for each of a model's fields."""
+    structural_fields = []
+    for name, field in model.__fields__.items():
+        type_ = field.type_
+        is_model = isinstance(type_, type) and issubclass(type_, BaseModel)
+        is_checked = field.shape in (SHAPE_LIST, SHAPE_SINGLETON)
+        structural_fields.append(
+            _StructuralField(
+                name=name,
+                required=bool(field.required),
+                allow_none=field.allow_none,
+                is_list=field.shape == SHAPE_LIST,
+                model=type_ if is_model and is_checked else None,
+                validator=_get_scalar_validator(type_) if is_checked else None,
+            )
+        )
+    return structural_fields
+
+
+def _construct_structural_value(
+    structural_field: _StructuralField, value: object, path: str
+) -> object:
+    if structural_field.model:
+        return construct_structural(structural_field.model, value, path)
+    if structural_field.validator:
+        try:
+            return structural_field.validator(value)
+        except (TypeError, ValueError) as err:
+            raise FidesValidationError(f"{path}: {err}") from err
+    return value
+
+
+def _construct_structural_list(
+    structural_field: _StructuralField, value: object, path: str
+) -> object:
+    if not isinstance(value, (list, tuple, set, frozenset)):
+        raise FidesValidationError(f"{path}: value is not a valid list")
+    if not structural_field.model and not structural_field.validator:
+        return value
+    return [
+        _construct_structural_value(structural_field, item, f"{path}.{index}")
+        for index, item in enumerate(value)
+    ]
+
+
+def _construct_structural_field(
+    structural_field: _StructuralField, value: object, path: str
+) -> object:
+    if value is None:
+        if not structural_field.allow_none:
+            raise FidesValidationError(f"{path}: none is not an allowed value")
+        return None
+    if structural_field.is_list:
+        return _construct_structural_list(structural_field, value, path)
+    return _construct_structural_value(structural_field, value, path)
+
+
+def _apply_structural_compat(model: Type[BaseModel], values: Dict) -> Dict:
+    """
+    Apply the input mapping a model's `__init__` would, which `construct`
+    skips, such as renaming the legacy `fidesops_meta` to `fides_meta`.
+    """
+    if issubclass(model, FidesopsMetaBackwardsCompat) and "fidesops_meta" in values:
+        values = dict(values)
+        fidesops_meta = values.pop("fidesops_meta")
+        values["fides_meta"] = values.get("fides_meta") or fidesops_meta
+    return values
+
+
+def construct_structural(model: Type[ModelT], values: object, path: str = "") -> ModelT:
+    """
+    Build a model from `values`, only checking the resource's structure.
+
+    Required fields must be present, nested models must be mappings or lists
+    of them, and every FidesKey, str, bool and int value must be coercible
+    the way a full parse coerces it. None of the model's validators run and
+    every other value is kept as it is, so the result should be passed
+    through `validate_resource` before it's relied on beyond that.
+    """
+    if isinstance(values, model):
+        return values
+    if not isinstance(values, dict):
+        raise FidesValidationError(
+            f"{path or model.__name__}: expected a mapping for {model.__name__}"
+        )
+    values = _apply_structural_compat(model, values)
+
+    fields = {}
+    for structural_field in _get_structural_fields(model):
+        name = structural_field.name
+        if name in values:
+            fields[name] = _construct_structural_field(
+                structural_field, values[name], f"{path}.{name}" if path else name
+            )
+        elif structural_field.required:
+            field_path = f"{path}.{name}" if path else name
+            raise FidesValidationError(f"{field_path}: field required")
+    return model.construct(_fields_set=set(fields), **fields)
+
+
+def validate_resource(resource: ModelT) -> ModelT:
+    """
+    Fully validate a resource that was parsed in structural mode, returning a
+    new, validated copy of it.
+
+    Raises a pydantic `ValidationError` if the resource isn't valid.
+    """
+    return type(resource).parse_obj(resource.dict(exclude_unset=True))
 
 
 def parse_dict(
-    resource_type: str, resource: Dict, from_server: bool = False
+    resource_type: str,
+    resource: Dict,
+    from_server: bool = False,
+    source_location: Optional["SourceLocation"] = None,
+    structural: bool = False,
 ) -> FidesModel:
     """
     Parse an individual resource into its Python model.
+
+    When the resource's `source_location` is known, it is reported on failure.
+    When `structural` is set, only the resource's structure is checked.
     """
     resource_source = "server" if from_server else "manifest file"
+    if source_location:
+        resource_source = str(source_location)
     if resource_type not in list(model_map.keys()):
         print(f"This resource type does not exist: {resource_type}")
         raise SystemExit(1)
 
     try:
-        parsed_manifest = model_map[resource_type].parse_obj(resource)
+        parsed_manifest = _parse_resource(
+            model_map[resource_type], resource, structural
+        )
     except Exception as err:
         print(
             "Failed to parse {} from {}:\n{}".format(
@@ -30,16 +217,274 @@ def parse_dict(
     return parsed_manifest
 
 
-def load_manifests_into_taxonomy(raw_manifests: Dict[str, List[Dict]]) -> Taxonomy:
+def _parse_resource(
+    model: Type[ModelT], resource: Dict, structural: bool = False
+) -> ModelT:
+    if structural:
+        return construct_structural(model, resource)
+    return model.parse_obj(resource)
+
+
+def build_taxonomy(parsed_manifests: Dict[str, List[BaseModel]]) -> Taxonomy:
+    """
+    Assemble a Taxonomy from resources that have already been validated,
+    without validating them a second time.
+
+    Resource types that aren't part of a Taxonomy are dropped, as they would
+    be by `Taxonomy.parse_obj`.
+    """
+    resources_by_type = {
+        resource_type: resources
+        for resource_type, resources in parsed_manifests.items()
+        if resource_type in Taxonomy.__fields__
+    }
+    return Taxonomy.construct(**resources_by_type)  # type: ignore[arg-type]
+
+
+def load_manifests_into_taxonomy(
+    raw_manifests: Dict[str, List[Dict]],
+    source_locations: Optional[Dict[str, List["SourceLocation"]]] = None,
+    parallel: bool = False,
+    max_workers: Optional[int] = None,
+    structural: bool = False,
+) -> Taxonomy:
     """
     Parse the raw resource manifests into resource resources.
+
+    `source_locations` is the side table returned alongside the manifests by
+    `ingest_manifests_with_locations`, used to report where failures are.
+    When `structural` is set, only each resource's structure is checked.
+
+    When `parallel` is set, the resources are validated in batches across a
+    pool of `max_workers` processes. The resources keep their manifest order,
+    and the first failure is reported exactly as it would be serially.
     """
-    taxonomy = Taxonomy.parse_obj(
+    if parallel:
+        taxonomy, failures = parse_manifests(
+            raw_manifests, source_locations, parallel, max_workers, structural
+        )
+        if failures:
+            # Re-parse the first failure in this process so that it's
+            # reported and raised exactly as it is by a serial parse
+            failure = failures[0]
+            parse_dict(
+                failure.resource_type,
+                raw_manifests[failure.resource_type][failure.position],
+                source_location=failure.source_location,
+                structural=structural,
+            )
+        return taxonomy
+
+    return build_taxonomy(
         {
             resource_type: [
-                parse_dict(resource_type, resource) for resource in resource_list
+                parse_dict(
+                    resource_type,
+                    resource,
+                    source_location=_get_source_location(
+                        source_locations, resource_type, index
+                    ),
+                    structural=structural,
+                )
+                for index, resource in enumerate(resource_list)
             ]
             for resource_type, resource_list in raw_manifests.items()
         }
     )
-    return taxonomy
+
+
+def _get_source_location(
+    source_locations: Optional[Dict[str, List["SourceLocation"]]],
+    resource_type: str,
+    index: int,
+) -> Optional["SourceLocation"]:
+    if source_locations and resource_type in source_locations:
+        return source_locations[resource_type][index]
+    return None
+
+
+class ParseFailure(NamedTuple):
+    """A resource that failed to parse, as collected by `parse_manifests`."""
+
+    resource_type: str
+    position: int
+    fides_key: Optional[str]
+    message: str
+    errors: List[Dict]
+    source_location: Optional["SourceLocation"] = None
+
+
+def parse_resource_batch(
+    resource_type: str, resources: List[Dict], structural: bool = False
+) -> List[Union[BaseModel, Exception]]:
+    """
+    Parse a batch of resources of a single type, returning either the model or
+    the exception raised for each resource, in order.
+    """
+    if resource_type not in model_map:
+        err = ValueError(f"This resource type does not exist: {resource_type}")
+        return [err for _ in resources]
+
+    model = model_map[resource_type]
+    results: List[Union[BaseModel, Exception]] = []
+    for resource in resources:
+        try:
+            results.append(_parse_resource(model, resource, structural))
+        except Exception as err:  # pylint: disable=broad-except
+            results.append(err)
+    return results
+
+
+def get_resource_batches(
+    raw_manifests: Dict[str, List[Dict]], batch_size: Optional[int] = None
+) -> List[Tuple[str, int, List[Dict]]]:
+    """
+    Split the raw manifests into `(resource_type, start_index, resources)`
+    batches of at most `batch_size` resources, or one batch per resource type.
+    """
+    return [
+        (resource_type, start, resource_list[start : start + size])
+        for resource_type, resource_list in raw_manifests.items()
+        for size in [batch_size or len(resource_list) or 1]
+        for start in range(0, len(resource_list), size)
+    ]
+
+
+def parse_resource_batches(
+    batches: List[Tuple[str, int, List[Dict]]],
+    parallel: bool = False,
+    max_workers: Optional[int] = None,
+    structural: bool = False,
+) -> List[List[Union[BaseModel, Exception]]]:
+    """
+    Parse every batch, optionally across a pool of `max_workers` processes.
+
+    The results are returned in the same order as the batches either way.
+    """
+    if not parallel:
+        return [
+            parse_resource_batch(resource_type, resources, structural)
+            for resource_type, _, resources in batches
+        ]
+
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        return list(
+            executor.map(
+                partial(parse_resource_batch, structural=structural),
+                [resource_type for resource_type, _, _ in batches],
+                [resources for _, _, resources in batches],
+            )
+        )
+
+
+def _iter_batch_results(
+    batches: List[Tuple[str, int, List[Dict]]],
+    batch_results: List[List[Union[BaseModel, Exception]]],
+) -> Iterator[Tuple[str, int, Dict, Union[BaseModel, Exception]]]:
+    """Pair each resource in the batches with its result and manifest position."""
+    for (resource_type, start, resources), results in zip(batches, batch_results):
+        for index, (resource, result) in enumerate(zip(resources, results), start):
+            yield resource_type, index, resource, result
+
+
+def get_parse_failure(
+    resource_type: str,
+    position: int,
+    resource: Dict,
+    err: Exception,
+    source_location: Optional["SourceLocation"] = None,
+) -> ParseFailure:
+    """Describe why a resource failed to parse."""
+    return ParseFailure(
+        resource_type=resource_type,
+        position=position,
+        fides_key=resource.get("fides_key") if isinstance(resource, dict) else None,
+        message=str(err),
+        errors=(
+            [dict(error) for error in err.errors()]
+            if isinstance(err, ValidationError)
+            else [{"loc": (), "msg": str(err), "type": type(err).__name__}]
+        ),
+        source_location=source_location,
+    )
+
+
+def parse_manifests(
+    raw_manifests: Dict[str, List[Dict]],
+    source_locations: Optional[Dict[str, List["SourceLocation"]]] = None,
+    parallel: bool = False,
+    max_workers: Optional[int] = None,
+    structural: bool = False,
+) -> Tuple[Taxonomy, List[ParseFailure]]:
+    """
+    Parse the raw resource manifests without stopping at the first failure.
+
+    Returns a Taxonomy of every resource that parsed, along with a
+    `ParseFailure` for each one that didn't, in manifest order, so that all of
+    the errors can be reported in a single pass. When `parallel` is set, the
+    resources are validated in batches across a pool of `max_workers`
+    processes. When `structural` is set, only each resource's structure is
+    checked.
+    """
+    batches = get_resource_batches(
+        raw_manifests,
+        batch_size=_get_batch_size(raw_manifests, max_workers) if parallel else None,
+    )
+    batch_results = parse_resource_batches(
+        batches, parallel, max_workers, structural=structural
+    )
+
+    parsed_manifests: Dict[str, List[BaseModel]] = {
+        resource_type: [] for resource_type in raw_manifests
+    }
+    failures: List[ParseFailure] = []
+    for resource_type, index, resource, result in _iter_batch_results(
+        batches, batch_results
+    ):
+        if isinstance(result, Exception):
+            failures.append(
+                get_parse_failure(
+                    resource_type,
+                    index,
+                    resource,
+                    result,
+                    source_location=_get_source_location(
+                        source_locations, resource_type, index
+                    ),
+                )
+            )
+        else:
+            parsed_manifests[resource_type].append(result)
+
+    return build_taxonomy(parsed_manifests), failures
+
+
+def get_chunksize(item_count: int, max_workers: Optional[int] = None) -> int:
+    """
+    Pick a chunksize that hands each worker a few batches of work, keeping
+    the inter-process overhead low without starving any of the workers.
+    """
+    workers = max_workers or os.cpu_count() or 1
+    return max(1, item_count // (workers * 4))
+
+
+def _get_batch_size(
+    raw_manifests: Dict[str, List[Dict]], max_workers: Optional[int]
+) -> int:
+    return get_chunksize(
+        sum(len(resource_list) for resource_list in raw_manifests.values()),
+        max_workers,
+    )
+
+
+async def load_manifests_into_taxonomy_async(
+    raw_manifests: Dict[str, List[Dict]], executor: Optional[Executor] = None
+) -> Taxonomy:
+    """
+    The asyncio counterpart of `load_manifests_into_taxonomy`, which runs the
+    model validation in `executor` so that the event loop isn't blocked.
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        executor, load_manifests_into_taxonomy, raw_manifests
+    )
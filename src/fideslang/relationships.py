@@ -3,13 +3,13 @@ This module is responsible for calculating what resources are referenced
 by each other and building a dependency graph of relationships.
 """
 
-import inspect
-from enum import Enum
-from functools import reduce
-from typing import List, Optional, Set
+from collections import deque
+from functools import lru_cache
+from typing import Dict, Iterator, List, NamedTuple, Optional, Set, Tuple, Type
+
+from pydantic.fields import SHAPE_LIST, SHAPE_SINGLETON
 
 from fideslang.models import BaseModel, FidesKey, Taxonomy
-from fideslang.utils import get_resource_by_fides_key
 
 
 def find_nested_keys_in_list(parameter_value: List[BaseModel]) -> List[str]:
@@ -24,66 +24,366 @@ def find_nested_keys_in_list(parameter_value: List[BaseModel]) -> List[str]:
     return nested_keys
 
 
+class ReferencePlan(NamedTuple):
+    """
+    The attributes of a model class that can hold FidesKey references.
+
+    `keys` hold a single FidesKey, `key_lists` hold a list of them and
+    `nested` hold other models, or lists of them, to recurse into.
+    """
+
+    keys: Tuple[str, ...]
+    key_lists: Tuple[str, ...]
+    nested: Tuple[str, ...]
+
+
+@lru_cache(maxsize=None)
+def get_reference_plan(model: Type[BaseModel]) -> ReferencePlan:
+    """
+    Work out which of a model's fields can reference other resources.
+
+    Plans are computed once per model class from its pydantic fields, so
+    finding references doesn't introspect every resource it walks. Whether a
+    field is optional doesn't matter. Fields whose type can't be pinned to a
+    single class, such as unions, are treated as nested and checked at
+    runtime.
+    """
+    keys: List[str] = []
+    key_lists: List[str] = []
+    nested: List[str] = []
+    for name, field in model.__fields__.items():
+        field_type = field.type_
+        if not isinstance(field_type, type):
+            nested.append(name)
+        elif issubclass(field_type, FidesKey):
+            if field.shape == SHAPE_SINGLETON:
+                keys.append(name)
+            elif field.shape == SHAPE_LIST:
+                key_lists.append(name)
+        elif issubclass(field_type, BaseModel):
+            nested.append(name)
+    return ReferencePlan(tuple(keys), tuple(key_lists), tuple(nested))
+
+
+def _iter_nested_models(
+    attribute_value: object, attribute_path: str
+) -> Iterator[Tuple[str, BaseModel]]:
+    if isinstance(attribute_value, BaseModel):
+        yield attribute_path, attribute_value
+    elif isinstance(attribute_value, list):
+        for index, element in enumerate(attribute_value):
+            if isinstance(element, BaseModel):
+                yield f"{attribute_path}.{index}", element
+
+
+def _walk_references(
+    resource: BaseModel, attribute_path: str
+) -> Iterator[Tuple[str, str, FidesKey]]:
+    """
+    Walk a resource's reference plans, yielding the path of the model holding
+    each referenced FidesKey, the attribute holding it and the key itself.
+    """
+    plan = get_reference_plan(type(resource))
+    attributes = resource.__dict__
+    for name in plan.keys:
+        if attributes.get(name):
+            yield attribute_path, name, attributes[name]
+    for name in plan.key_lists:
+        for fides_key in attributes.get(name) or []:
+            yield attribute_path, name, fides_key
+    for name in plan.nested:
+        for nested_path, nested_model in _iter_nested_models(
+            attributes.get(name), f"{attribute_path}.{name}" if attribute_path else name
+        ):
+            yield from _walk_references(nested_model, nested_path)
+
+
+def _add_referenced_fides_keys(
+    resource: BaseModel, referenced_fides_keys: Set[FidesKey]
+) -> None:
+    referenced_fides_keys.update(
+        fides_key for _, _, fides_key in _walk_references(resource, "")
+    )
+
+
 def find_referenced_fides_keys(resource: object) -> Set[FidesKey]:
     """
-    Use type-signature introspection to figure out which fields
-    include the FidesKey type and return all of those values.
+    Use each model's cached `ReferencePlan` to find the fields that include
+    the FidesKey type and return all of those values.
 
     Note that this finds _all_ fides_keys, including the resource's own fides_key
 
-    This function is used recursively for arbitrary-depth objects.
+    Nested models are walked to an arbitrary depth. Anything that isn't a
+    Pydantic model has no references.
     """
     referenced_fides_keys: Set[FidesKey] = set()
+    if isinstance(resource, BaseModel):
+        _add_referenced_fides_keys(resource, referenced_fides_keys)
+    return referenced_fides_keys
 
-    # Str type doesn't have a signature, so we return early
-    if isinstance(resource, str) and not isinstance(resource, Enum):
-        return set()
 
-    signature = inspect.signature(type(resource), follow_wrapped=True)
-    attributes = filter(
-        lambda parameter: hasattr(resource, parameter.name),
-        signature.parameters.values(),
-    )
+def iter_references(
+    resource: BaseModel, attribute_path: str = ""
+) -> Iterator[Tuple[str, FidesKey]]:
+    """
+    Yield an `(attribute_path, fides_key)` pair for every FidesKey referenced
+    by a resource, excluding its own fides_key.
 
-    for attribute in attributes:
-        attribute_value = resource.__getattribute__(attribute.name)
-        if attribute_value:
-            # If it is a single FidesKey, add it directly
-            if attribute.annotation in (FidesKey, Optional[FidesKey]):
-                referenced_fides_keys.add(attribute_value)
-            # Add the list of FidesKeys to the set
-            elif attribute.annotation == List[FidesKey]:
-                referenced_fides_keys.update(resource.__getattribute__(attribute.name))
-            # If it is a list, but not of strings, recurse into each one
-            elif (
-                isinstance(attribute_value, list) and attribute.annotation != List[str]
-            ):
-                nested_keys = find_nested_keys_in_list(attribute_value)
-                referenced_fides_keys.update(nested_keys)
-            # If it is a Pydantic Model then recurse
-            elif isinstance(attribute_value, BaseModel):
-                referenced_fides_keys.update(
-                    find_referenced_fides_keys(attribute_value)
-                )
-    return referenced_fides_keys
+    Paths are dotted attribute names, with the position of each nested model
+    within a list, such as `privacy_declarations.0.data_use`.
+    """
+    for path, name, fides_key in _walk_references(resource, attribute_path):
+        if path or name != "fides_key":
+            yield f"{path}.{name}" if path else name, fides_key
 
 
 def get_referenced_missing_keys(taxonomy: Taxonomy) -> Set[FidesKey]:
     """
-    Iterate through the Taxonomy and create a set of all of the FidesKeys
-    that are contained within it.
+    Iterate through the Taxonomy and return the set of referenced FidesKeys
+    that aren't the fides_key of any resource within it.
+
+    Both the references and the keys in the Taxonomy are collected into sets
+    in a single pass, so this runs in linear time.
     """
-    referenced_keys: List[Set[FidesKey]] = [
-        find_referenced_fides_keys(resource)
-        for resource_type in taxonomy.__fields_set__
-        for resource in getattr(taxonomy, resource_type)
-    ]
-    key_set: Set[FidesKey] = set(
-        reduce(lambda x, y: set().union(x).union(y), referenced_keys)
-    )
-    keys_not_in_taxonomy = {
-        fides_key
-        for fides_key in key_set
-        if get_resource_by_fides_key(taxonomy, fides_key) is None
-    }
-    return keys_not_in_taxonomy
+    referenced_keys: Set[FidesKey] = set()
+    taxonomy_keys: Set[str] = set()
+    for resource_type in taxonomy.__fields_set__:
+        for resource in getattr(taxonomy, resource_type) or []:
+            taxonomy_keys.add(resource.fides_key)
+            _add_referenced_fides_keys(resource, referenced_keys)
+    return referenced_keys.difference(taxonomy_keys)
+
+
+class DependencyCycleError(ValueError):
+    """Raised when resources can't be ordered because they reference each other."""
+
+
+class ResourceNode(NamedTuple):
+    """A resource in a `DependencyGraph`, identified by its type and fides_key."""
+
+    resource_type: str
+    fides_key: str
+
+
+class DependencyGraph:
+    """
+    A graph of the resources in a Taxonomy, with an edge from each resource to
+    every resource it references.
+
+    References only record a fides_key, so a reference is an edge to every
+    resource in the taxonomy with that key, whatever its type, so a resource
+    referencing a resource of another type with the same fides_key depends
+    on it. A resource's own top-level fides_key isn't a reference and a
+    resource never depends on itself, such as a dataset whose fields
+    reference each other. Referenced keys that aren't in the taxonomy are
+    collected in `missing_keys` instead of becoming edges.
+    """
+
+    def __init__(self, taxonomy: Taxonomy) -> None:
+        resources = {
+            ResourceNode(resource_type, resource.fides_key): resource
+            for resource_type in Taxonomy.__fields__
+            if resource_type in taxonomy.__fields_set__
+            for resource in getattr(taxonomy, resource_type) or []
+        }
+        self.nodes: List[ResourceNode] = list(resources)
+
+        nodes_by_key: Dict[str, List[ResourceNode]] = {}
+        for node in self.nodes:
+            nodes_by_key.setdefault(node.fides_key, []).append(node)
+
+        self.edges: Dict[ResourceNode, List[ResourceNode]] = {}
+        self.reverse_edges: Dict[ResourceNode, List[ResourceNode]] = {
+            node: [] for node in self.nodes
+        }
+        self.missing_keys: Dict[ResourceNode, Set[FidesKey]] = {}
+        for node, resource in resources.items():
+            self._add_edges(node, resource, nodes_by_key)
+
+    def _add_edges(
+        self,
+        node: ResourceNode,
+        resource: BaseModel,
+        nodes_by_key: Dict[str, List[ResourceNode]],
+    ) -> None:
+        self.edges[node] = []
+        for fides_key in sorted(
+            {fides_key for _, fides_key in iter_references(resource)}
+        ):
+            if fides_key not in nodes_by_key:
+                self.missing_keys.setdefault(node, set()).add(fides_key)
+                continue
+            for dependency in nodes_by_key[fides_key]:
+                if dependency != node:
+                    self.edges[node].append(dependency)
+                    self.reverse_edges[dependency].append(node)
+
+    def __contains__(self, node: ResourceNode) -> bool:
+        return node in self.edges
+
+    def __len__(self) -> int:
+        return len(self.nodes)
+
+    def get_dependencies(self, node: ResourceNode) -> List[ResourceNode]:
+        """The resources that `node` references."""
+        return list(self.edges[node])
+
+    def get_dependents(self, node: ResourceNode) -> List[ResourceNode]:
+        """The resources that reference `node`."""
+        return list(self.reverse_edges[node])
+
+    def topological_order(self) -> List[ResourceNode]:
+        """
+        Order the resources so that every resource comes after the resources it
+        references, which is the order to upsert them in. Reverse it to get
+        the order to delete them in.
+
+        Raises a `DependencyCycleError` if some resources reference each other.
+        """
+        remaining_dependencies = {node: len(self.edges[node]) for node in self.nodes}
+        ready = deque(node for node in self.nodes if not remaining_dependencies[node])
+        order: List[ResourceNode] = []
+        while ready:
+            node = ready.popleft()
+            order.append(node)
+            for dependent in self.reverse_edges[node]:
+                remaining_dependencies[dependent] -= 1
+                if not remaining_dependencies[dependent]:
+                    ready.append(dependent)
+
+        if len(order) < len(self.nodes):
+            cycle = self._find_cycle()
+            raise DependencyCycleError(
+                "Resources reference each other: "
+                + ", ".join(f"{node.resource_type}:{node.fides_key}" for node in cycle)
+            )
+        return order
+
+    def strongly_connected_components(self) -> List[List[ResourceNode]]:
+        """
+        Group the resources into strongly connected components, using Tarjan's
+        algorithm.
+
+        A component with more than one resource is a reference cycle. The
+        components are returned with every component after the components it
+        references, so they can be upserted in order even when there are
+        cycles.
+        """
+        walk = _TarjanWalk(self.edges)
+        for root in self.nodes:
+            if root not in walk.indexes:
+                walk.visit(root)
+        return walk.components
+
+    def _find_cycle(self) -> List[ResourceNode]:
+        for component in self.strongly_connected_components():
+            if len(component) > 1 or component[0] in self.edges[component[0]]:
+                return component
+        return []
+
+
+class _TarjanWalk:
+    """
+    The state of Tarjan's algorithm over a graph's edges, collecting each
+    strongly connected component once all of its references are collected.
+    """
+
+    def __init__(self, edges: Dict[ResourceNode, List[ResourceNode]]) -> None:
+        self.edges = edges
+        self.indexes: Dict[ResourceNode, int] = {}
+        self.lowlinks: Dict[ResourceNode, int] = {}
+        self.stack: List[ResourceNode] = []
+        self.on_stack: Set[ResourceNode] = set()
+        self.components: List[List[ResourceNode]] = []
+
+    def visit(self, root: ResourceNode) -> None:
+        """
+        Walk depth-first from `root` with an explicit stack of dependency
+        iterators, so that deep reference chains don't hit the recursion limit.
+        """
+        work = [self._push(root)]
+        while work:
+            node, dependencies = work[-1]
+            dependency = self._next_unvisited(node, dependencies)
+            if dependency is not None:
+                work.append(self._push(dependency))
+                continue
+
+            work.pop()
+            if work:
+                parent = work[-1][0]
+                self.lowlinks[parent] = min(self.lowlinks[parent], self.lowlinks[node])
+            if self.lowlinks[node] == self.indexes[node]:
+                self._pop_component(node)
+
+    def _push(self, node: ResourceNode) -> Tuple[ResourceNode, Iterator[ResourceNode]]:
+        self.indexes[node] = self.lowlinks[node] = len(self.indexes)
+        self.stack.append(node)
+        self.on_stack.add(node)
+        return node, iter(self.edges[node])
+
+    def _next_unvisited(
+        self, node: ResourceNode, dependencies: Iterator[ResourceNode]
+    ) -> Optional[ResourceNode]:
+        for dependency in dependencies:
+            if dependency not in self.indexes:
+                return dependency
+            if dependency in self.on_stack:
+                self.lowlinks[node] = min(self.lowlinks[node], self.indexes[dependency])
+        return None
+
+    def _pop_component(self, node: ResourceNode) -> None:
+        component: List[ResourceNode] = []
+        member = None
+        while member != node:
+            member = self.stack.pop()
+            self.on_stack.discard(member)
+            component.append(member)
+        self.components.append(component)
+
+
+class Reference(NamedTuple):
+    """Where a FidesKey is referenced: a resource and the attribute path within it."""
+
+    resource_type: str
+    fides_key: str
+    attribute_path: str
+
+
+class ReverseReferenceIndex:
+    """
+    An index from each FidesKey to every place in a Taxonomy that references
+    it, such as the dataset fields, privacy declarations, data flows and
+    policy rules that use a data category.
+
+    The index is built in a single pass over the taxonomy, after which each
+    lookup is a single dictionary access. Changes to the taxonomy after the
+    index is built aren't seen by it.
+    """
+
+    def __init__(self, taxonomy: Taxonomy) -> None:
+        self._references: Dict[str, List[Reference]] = {}
+        for resource_type in Taxonomy.__fields__:
+            if resource_type not in taxonomy.__fields_set__:
+                continue
+            for resource in getattr(taxonomy, resource_type) or []:
+                for attribute_path, fides_key in iter_references(resource):
+                    self._references.setdefault(fides_key, []).append(
+                        Reference(resource_type, resource.fides_key, attribute_path)
+                    )
+
+    def __contains__(self, fides_key: str) -> bool:
+        return fides_key in self._references
+
+    def get_references(self, fides_key: str) -> List[Reference]:
+        """Every reference to a FidesKey, in taxonomy order."""
+        return list(self._references.get(fides_key, []))
+
+    def get_referencing_resources(self, fides_key: str) -> List[ResourceNode]:
+        """The resources that reference a FidesKey, without duplicates."""
+        return list(
+            dict.fromkeys(
+                ResourceNode(reference.resource_type, reference.fides_key)
+                for reference in self._references.get(fides_key, [])
+            )
+        )
@@ -2,7 +2,7 @@
 Utils for use within various fideslang modules.
 """
 
-from typing import Dict, Optional
+from typing import Dict, Iterable, Optional
 
 from fideslang import FidesModel, Taxonomy
 
@@ -12,6 +12,9 @@ def get_resource_by_fides_key(
 ) -> Optional[Dict[str, FidesModel]]:
     """
     Recurse through a taxonomy to find a specific resource its fides_key.
+
+    This scans the whole taxonomy on every call, so use a `TaxonomyIndex`
+    for repeated lookups.
     """
 
     return {
@@ -20,3 +23,82 @@ def get_resource_by_fides_key(
         for resource in getattr(taxonomy, resource_type)
         if resource.fides_key == fides_key
     } or None
+
+
+class TaxonomyIndex:
+    """
+    A hash index of a Taxonomy's resources, by fides_key and then by resource
+    type, for constant-time lookups.
+
+    Lookups return the same results as `get_resource_by_fides_key`. Resources
+    added or removed through the index are also added to or removed from the
+    taxonomy, keeping the two consistent. Changes made to the taxonomy
+    directly aren't seen by the index.
+    """
+
+    def __init__(self, taxonomy: Taxonomy) -> None:
+        self.taxonomy = taxonomy
+        self._resources: Dict[str, Dict[str, FidesModel]] = {}
+        for resource_type in taxonomy.__fields_set__:
+            for resource in getattr(taxonomy, resource_type) or []:
+                self._resources.setdefault(resource.fides_key, {})[
+                    resource_type
+                ] = resource
+
+    def __contains__(self, fides_key: str) -> bool:
+        return fides_key in self._resources
+
+    def __len__(self) -> int:
+        return len(self._resources)
+
+    def get(self, fides_key: str) -> Optional[Dict[str, FidesModel]]:
+        """Return the resources with the given fides_key, by resource type."""
+        resources = self._resources.get(fides_key)
+        return dict(resources) if resources else None
+
+    def get_many(
+        self, fides_keys: Iterable[str]
+    ) -> Dict[str, Optional[Dict[str, FidesModel]]]:
+        """Look up several fides_keys at once, keyed by fides_key."""
+        return {fides_key: self.get(fides_key) for fides_key in fides_keys}
+
+    def add(self, resource_type: str, resource: FidesModel) -> None:
+        """
+        Add a resource to the taxonomy, replacing any resource of the same
+        type with the same fides_key in its existing position.
+        """
+        if resource_type not in Taxonomy.__fields__:
+            raise ValueError(f"This resource type does not exist: {resource_type}")
+
+        resources = getattr(self.taxonomy, resource_type) or []
+        if resource_type in self._resources.get(resource.fides_key, {}):
+            # Replace the existing resource where it is, keeping the order
+            resources = [
+                resource if existing.fides_key == resource.fides_key else existing
+                for existing in resources
+            ]
+        else:
+            resources = [*resources, resource]
+        setattr(self.taxonomy, resource_type, resources)
+        self._resources.setdefault(resource.fides_key, {})[resource_type] = resource
+
+    def remove(self, resource_type: str, fides_key: str) -> Optional[FidesModel]:
+        """
+        Remove a resource from the taxonomy, returning it if it was there.
+        """
+        resource = self._resources.get(fides_key, {}).pop(resource_type, None)
+        if resource is None:
+            return None
+
+        if not self._resources[fides_key]:
+            del self._resources[fides_key]
+        setattr(
+            self.taxonomy,
+            resource_type,
+            [
+                existing
+                for existing in getattr(self.taxonomy, resource_type)
+                if existing.fides_key != fides_key
+            ],
+        )
+        return resource
@@ -176,3 +176,10 @@ def populated_nested_manifest_dir(test_manifests, tmp_path):
         with open(f"{nested_manifest_dir}/{manifest}.yml", "w") as manifest_file:
             yaml.dump(test_manifests[manifest], manifest_file)
     return manifest_dir
+
+
+@pytest.fixture(params=["gz", "zst"])
+def compression(request):
+    if request.param == "zst":
+        pytest.importorskip("zstandard")
+    return request.param
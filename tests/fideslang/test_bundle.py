@@ -0,0 +1,149 @@
+import json
+import mmap
+
+import pydantic.main
+import pytest
+
+from fideslang import bundle
+from fideslang.default_taxonomy import DEFAULT_TAXONOMY
+from fideslang.models import DataCategory, DataUse, Taxonomy
+
+
+@pytest.fixture()
+def bundle_path(tmp_path):
+    bundle_path = str(tmp_path / "taxonomy.bundle")
+    bundle.compile_taxonomy(DEFAULT_TAXONOMY, bundle_path)
+    return bundle_path
+
+
+@pytest.mark.unit
+class TestTaxonomyBundle:
+    def test_round_trip(self, bundle_path):
+        assert bundle.load_taxonomy_bundle(bundle_path) == DEFAULT_TAXONOMY
+
+    def test_load_does_not_validate(self, bundle_path, monkeypatch):
+        def fail_validation(*args, **kwargs):
+            raise AssertionError("Bundled models should not be re-validated")
+
+        monkeypatch.setattr(pydantic.main, "validate_model", fail_validation)
+        taxonomy = bundle.load_taxonomy_bundle(bundle_path)
+        assert len(taxonomy.data_category) == len(DEFAULT_TAXONOMY.data_category)
+
+    def test_version_mismatch(self, bundle_path, monkeypatch):
+        monkeypatch.setattr(bundle, "__version__", "0.0.0")
+        with pytest.raises(bundle.TaxonomyBundleError, match="0.0.0 is installed"):
+            bundle.load_taxonomy_bundle(bundle_path)
+
+    def test_format_mismatch(self, bundle_path, monkeypatch):
+        monkeypatch.setattr(bundle, "BUNDLE_FORMAT_VERSION", 0)
+        with pytest.raises(bundle.TaxonomyBundleError, match="Unsupported"):
+            bundle.load_taxonomy_bundle(bundle_path)
+
+    def test_invalid_bundle(self, tmp_path):
+        invalid_path = tmp_path / "invalid.bundle"
+        invalid_path.write_bytes(b"data_category: []")
+        with pytest.raises(bundle.TaxonomyBundleError, match="Invalid"):
+            bundle.load_taxonomy_bundle(str(invalid_path))
+
+
+@pytest.fixture()
+def mapped_taxonomy(tmp_path):
+    mapped_path = str(tmp_path / "taxonomy.map")
+    bundle.compile_mapped_taxonomy(DEFAULT_TAXONOMY, mapped_path)
+    with bundle.MappedTaxonomy(mapped_path) as mapped_taxonomy:
+        yield mapped_taxonomy
+
+
+@pytest.mark.unit
+class TestMappedTaxonomy:
+    def test_keys(self, mapped_taxonomy):
+        expected_keys = sorted(
+            resource.fides_key
+            for resource_type in DEFAULT_TAXONOMY.__fields__
+            for resource in getattr(DEFAULT_TAXONOMY, resource_type)
+        )
+        assert list(mapped_taxonomy.keys()) == expected_keys
+        assert len(mapped_taxonomy) == len(expected_keys)
+        assert "user.contact.email" in mapped_taxonomy
+        assert "not_a_key" not in mapped_taxonomy
+
+    def test_get_attributes(self, mapped_taxonomy):
+        data_category = next(
+            resource
+            for resource in DEFAULT_TAXONOMY.data_category
+            if resource.fides_key == "user.contact.email"
+        )
+        assert mapped_taxonomy.get_attributes("user.contact.email") == json.loads(
+            data_category.json()
+        )
+        assert mapped_taxonomy.get_attributes("user.contact.email", "data_use") is None
+        assert mapped_taxonomy.get_attributes("not_a_key") is None
+
+    def test_get_resource_types(self, mapped_taxonomy):
+        assert mapped_taxonomy.get_resource_types("default_organization") == [
+            "organization"
+        ]
+        assert mapped_taxonomy.get_resource_types("not_a_key") == []
+
+    def test_hierarchy(self, mapped_taxonomy):
+        assert mapped_taxonomy.get_parent("user.contact.email") == "user.contact"
+        assert mapped_taxonomy.get_parent("user") is None
+        assert mapped_taxonomy.get_children("user.contact") == sorted(
+            resource.fides_key
+            for resource in DEFAULT_TAXONOMY.data_category
+            if resource.parent_key == "user.contact"
+        )
+        assert mapped_taxonomy.get_children("user.contact.email") == []
+
+    def test_duplicate_keys_across_resource_types(self, tmp_path):
+        taxonomy = Taxonomy(
+            data_category=[DataCategory(fides_key="shared", name="Category")],
+            data_use=[DataUse(fides_key="shared", name="Use")],
+        )
+        mapped_path = str(tmp_path / "taxonomy.map")
+        bundle.compile_mapped_taxonomy(taxonomy, mapped_path)
+        with bundle.MappedTaxonomy(mapped_path) as mapped_taxonomy:
+            assert mapped_taxonomy.get_resource_types("shared") == [
+                "data_category",
+                "data_use",
+            ]
+            assert mapped_taxonomy.get_attributes("shared", "data_use")["name"] == "Use"
+
+    def test_invalid_file(self, tmp_path):
+        invalid_path = tmp_path / "invalid.map"
+        invalid_path.write_bytes(b"data_category: []")
+        with pytest.raises(bundle.TaxonomyBundleError, match="Invalid"):
+            bundle.MappedTaxonomy(str(invalid_path))
+
+    @pytest.fixture()
+    def opened_mmaps(self, monkeypatch):
+        opened_mmaps = []
+
+        class TrackingMmap(mmap.mmap):
+            def __new__(cls, *args, **kwargs):
+                opened_mmap = super().__new__(cls, *args, **kwargs)
+                opened_mmaps.append(opened_mmap)
+                return opened_mmap
+
+        monkeypatch.setattr(bundle.mmap, "mmap", TrackingMmap)
+        return opened_mmaps
+
+    @pytest.mark.parametrize("length", [0, 4, 30, -8])
+    def test_truncated_file(self, tmp_path, opened_mmaps, length):
+        mapped_path = tmp_path / "taxonomy.map"
+        bundle.compile_mapped_taxonomy(DEFAULT_TAXONOMY, str(mapped_path))
+        mapped_bytes = mapped_path.read_bytes()
+        mapped_path.write_bytes(mapped_bytes[: length % len(mapped_bytes)])
+
+        with pytest.raises(bundle.TaxonomyBundleError, match="Invalid"):
+            bundle.MappedTaxonomy(str(mapped_path))
+        assert all(opened_mmap.closed for opened_mmap in opened_mmaps)
+
+    def test_version_mismatch(self, tmp_path, opened_mmaps, monkeypatch):
+        mapped_path = str(tmp_path / "taxonomy.map")
+        bundle.compile_mapped_taxonomy(DEFAULT_TAXONOMY, mapped_path)
+
+        monkeypatch.setattr(bundle, "__version__", "0.0.0")
+        with pytest.raises(bundle.TaxonomyBundleError, match="0.0.0 is installed"):
+            bundle.MappedTaxonomy(mapped_path)
+        assert opened_mmaps and all(opened_mmap.closed for opened_mmap in opened_mmaps)
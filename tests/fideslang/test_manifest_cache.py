@@ -0,0 +1,82 @@
+import os
+
+import pytest
+
+from fideslang import __version__, manifest_cache, manifests
+
+
+@pytest.mark.unit
+def test_ingest_manifests_cache(populated_manifest_dir, tmp_path, monkeypatch):
+    cache_dir = str(tmp_path / "cache")
+    stale_version_dir = (
+        tmp_path / "cache" / manifest_cache.CACHE_DIR_NAME / "0.0.0-stale"
+    )
+    stale_version_dir.mkdir(parents=True)
+
+    uncached_result = manifests.ingest_manifests(populated_manifest_dir)
+    assert (
+        manifests.ingest_manifests(populated_manifest_dir, cache_dir=cache_dir)
+        == uncached_result
+    )
+    assert not stale_version_dir.exists()
+
+    def fail_load(file_path):
+        raise AssertionError(f"{file_path} should have been loaded from the cache")
+
+    monkeypatch.setattr(manifests, "load_manifest_into_dict", fail_load)
+    assert (
+        manifests.ingest_manifests(populated_manifest_dir, cache_dir=cache_dir)
+        == uncached_result
+    )
+
+
+@pytest.mark.unit
+def test_ingest_manifests_cache_keeps_unrelated_directories(
+    populated_manifest_dir, tmp_path
+):
+    (tmp_path / "src").mkdir()
+    (tmp_path / "src" / "module.py").write_text("")
+    manifests.ingest_manifests(populated_manifest_dir, cache_dir=str(tmp_path))
+
+    assert (tmp_path / "src" / "module.py").exists()
+    assert os.path.isdir(populated_manifest_dir)
+    assert os.listdir(tmp_path / manifest_cache.CACHE_DIR_NAME) == [__version__]
+
+
+@pytest.mark.unit
+def test_ingest_manifests_cache_invalidated_on_change(populated_manifest_dir, tmp_path):
+    cache_dir = str(tmp_path / "cache")
+    manifests.ingest_manifests(populated_manifest_dir, cache_dir=cache_dir)
+
+    manifests.write_manifest(
+        f"{populated_manifest_dir}/manifest_1.yml",
+        [{"fides_key": "changed_system"}],
+        "system",
+    )
+    actual_result = manifests.ingest_manifests(
+        populated_manifest_dir, cache_dir=cache_dir
+    )
+    assert [system["fides_key"] for system in actual_result["system"]] == [
+        "changed_system",
+        "another_system",
+    ]
+    assert len(
+        os.listdir(tmp_path / "cache" / manifest_cache.CACHE_DIR_NAME / __version__)
+    ) == len(manifests.get_manifest_list(populated_manifest_dir))
+
+
+@pytest.mark.unit
+def test_ingest_manifests_cache_skips_unmarshallable_values(tmp_path):
+    manifest_path = tmp_path / "systems.yml"
+    manifest_path.write_text("system:\n- fides_key: system\n  created: 2024-01-01\n")
+    cache_dir = str(tmp_path / "cache")
+
+    expected_result = manifests.ingest_manifests(str(manifest_path))
+    for _ in range(2):
+        assert (
+            manifests.ingest_manifests(str(manifest_path), cache_dir=cache_dir)
+            == expected_result
+        )
+    assert not os.listdir(
+        tmp_path / "cache" / manifest_cache.CACHE_DIR_NAME / __version__
+    )
@@ -0,0 +1,156 @@
+import os
+
+import pytest
+
+from fideslang import manifest_index, manifests, parse
+
+
+@pytest.mark.unit
+class TestManifestIndex:
+    @pytest.fixture()
+    def manifest_index_dir(self, tmp_path):
+        (tmp_path / "categories.yml").write_text(
+            """data_category:
+- fides_key: user
+  name: Usér Data
+  description: "Data about a user: ✓"
+- {fides_key: user.contact, name: Contact, parent_key: user}
+- fides_key: user.shared
+  name: &shared_name Shared
+  parent_key: user
+data_use:
+- fides_key: marketing
+  name: *shared_name
+""",
+            encoding="utf-8",
+        )
+        manifests.write_json_manifest(
+            str(tmp_path / "subjects.json"),
+            [{"fides_key": "customer", "name": "Customer"}],
+            "data_subject",
+        )
+        return tmp_path
+
+    def test_keys(self, manifest_index_dir):
+        index = manifest_index.ManifestIndex(
+            str(manifest_index_dir), extensions=manifests.ALL_MANIFEST_EXTENSIONS
+        )
+        assert index.keys() == [
+            "customer",
+            "marketing",
+            "user",
+            "user.contact",
+            "user.shared",
+        ]
+        assert len(index) == 5
+        assert "user.contact" in index
+        assert "missing" not in index
+        assert index.get("missing") is None
+
+    def test_get_raw_matches_full_load(self, manifest_index_dir):
+        index = manifest_index.ManifestIndex(str(manifest_index_dir))
+        raw_manifests = manifests.ingest_manifests(str(manifest_index_dir))
+        for resource_type, resources in raw_manifests.items():
+            for resource in resources:
+                assert index.get_raw(resource["fides_key"], resource_type) == resource
+
+    def test_get_validates_and_caches(self, manifest_index_dir):
+        index = manifest_index.ManifestIndex(str(manifest_index_dir))
+        data_category = index.get("user.contact")
+        assert data_category.parent_key == "user"
+        assert index.get("user.contact") is data_category
+        assert index.get_entry("user.contact").line == 5
+
+    def test_get_invalid_resource(self, tmp_path):
+        manifests.write_manifest(
+            str(tmp_path / "systems.yml"), [{"fides_key": "bad key"}], "system"
+        )
+        index = manifest_index.ManifestIndex(str(tmp_path))
+        with pytest.raises(SystemExit):
+            index.get("bad key")
+
+    def test_reindexes_changed_files(self, manifest_index_dir):
+        index = manifest_index.ManifestIndex(
+            str(manifest_index_dir), extensions=manifests.ALL_MANIFEST_EXTENSIONS
+        )
+        assert index.get("customer").name == "Customer"
+
+        manifests.write_json_manifest(
+            str(manifest_index_dir / "subjects.json"),
+            [
+                {"fides_key": "employee", "name": "Employee"},
+                {"fides_key": "customer", "name": "Changed"},
+            ],
+            "data_subject",
+        )
+        assert index.get("customer").name == "Changed"
+        assert "employee" in index
+
+        os.remove(manifest_index_dir / "subjects.json")
+        index.refresh()
+        assert "customer" not in index
+
+    def test_crlf_line_endings(self, tmp_path):
+        resources = [
+            {"fides_key": f"system_{index}", "name": f"Systém {index}"}
+            for index in range(40)
+        ]
+        manifests.write_manifest(str(tmp_path / "systems.yml"), resources, "system")
+        text = (tmp_path / "systems.yml").read_text(encoding="utf-8")
+        (tmp_path / "systems.yml").write_bytes(
+            text.replace("\n", "\r\n").encode("utf-8")
+        )
+
+        index = manifest_index.ManifestIndex(str(tmp_path))
+        for resource in resources:
+            assert index.get_raw(resource["fides_key"]) == resource
+
+    def test_get_raw_falls_back_on_mismatched_span(self, manifest_index_dir):
+        index = manifest_index.ManifestIndex(str(manifest_index_dir))
+        entry = index.get_entry("user.shared")
+        other_entry = index.get_entry("user.contact")
+        moved_entry = entry._replace(start=other_entry.start, end=other_entry.end)
+        assert manifest_index.load_manifest_index_entry(moved_entry, "user.shared") == {
+            "fides_key": "user.shared",
+            "name": "Shared",
+            "parent_key": "user",
+        }
+
+    def test_deleted_file_is_a_miss(self, manifest_index_dir):
+        index = manifest_index.ManifestIndex(str(manifest_index_dir))
+        os.remove(manifest_index_dir / "categories.yml")
+
+        assert index.get_entry("user") is None
+        assert index.get_raw("user.contact") is None
+        assert index.get("marketing") is None
+        assert index.keys() == []
+
+    def test_persisted_index(self, manifest_index_dir, tmp_path_factory, monkeypatch):
+        index_path = str(tmp_path_factory.mktemp("index") / "index.json")
+        index = manifest_index.ManifestIndex(str(manifest_index_dir), index_path)
+
+        def fail_index(file_path):
+            raise AssertionError(f"Unexpectedly re-indexed {file_path}")
+
+        monkeypatch.setattr(manifest_index, "index_manifest_file", fail_index)
+        reloaded_index = manifest_index.ManifestIndex(
+            str(manifest_index_dir), index_path
+        )
+        assert reloaded_index.keys() == index.keys()
+        assert reloaded_index.get_entry("user") == index.get_entry("user")
+        assert reloaded_index.get("user").name == "Usér Data"
+
+    def test_compressed_file(self, tmp_path, compression):
+        resources = [{"fides_key": f"system_{index}"} for index in range(3)]
+        manifests.write_manifest(
+            str(tmp_path / f"systems.yml.{compression}"), resources, "system"
+        )
+        index = manifest_index.ManifestIndex(str(tmp_path))
+        assert index.get_entry("system_1").position == 1
+        assert index.get_raw("system_1") == resources[1]
+
+    def test_validate_all(self, manifest_index_dir):
+        index = manifest_index.ManifestIndex(str(manifest_index_dir))
+        assert index.validate_all() == parse.load_manifests_into_taxonomy(
+            manifests.ingest_manifests(str(manifest_index_dir))
+        )
@@ -0,0 +1,115 @@
+import os
+
+import pytest
+
+from fideslang import manifest_tree, manifests, parse
+
+
+@pytest.mark.unit
+class TestManifestTree:
+    @pytest.fixture()
+    def manifest_tree_dir(self, tmp_path):
+        manifests.write_manifest(
+            str(tmp_path / "categories.yml"),
+            [{"fides_key": "user", "name": "User Data"}],
+            "data_category",
+        )
+        manifests.write_manifest(
+            str(tmp_path / "uses.yml"),
+            [{"fides_key": "marketing", "name": "Marketing"}],
+            "data_use",
+        )
+        return tmp_path
+
+    def test_initial_ingest(self, manifest_tree_dir):
+        tree = manifest_tree.ManifestTree(str(manifest_tree_dir))
+        assert tree.manifests == manifests.ingest_manifests(str(manifest_tree_dir))
+        assert tree.taxonomy == parse.load_manifests_into_taxonomy(
+            manifests.ingest_manifests(str(manifest_tree_dir))
+        )
+
+    def test_update_only_reloads_changed_files(self, manifest_tree_dir, monkeypatch):
+        tree = manifest_tree.ManifestTree(str(manifest_tree_dir))
+        tree.taxonomy
+
+        added_path = str(manifest_tree_dir / "subjects.yml")
+        changed_path = str(manifest_tree_dir / "categories.yml")
+        deleted_path = str(manifest_tree_dir / "uses.yml")
+        manifests.write_manifest(
+            added_path, [{"fides_key": "customer"}], "data_subject"
+        )
+        manifests.write_manifest(
+            changed_path, [{"fides_key": "system"}], "data_category"
+        )
+        os.remove(deleted_path)
+
+        loaded_paths = []
+        load_manifest_into_dict = manifests.load_manifest_into_dict
+
+        def tracking_load(file_path):
+            loaded_paths.append(file_path)
+            return load_manifest_into_dict(file_path)
+
+        monkeypatch.setattr(manifest_tree, "load_manifest_into_dict", tracking_load)
+        tree.update([added_path, changed_path, deleted_path, "README.md"])
+
+        assert sorted(loaded_paths) == sorted([added_path, changed_path])
+        assert tree.manifests == {
+            "data_category": [{"fides_key": "system"}],
+            "data_subject": [{"fides_key": "customer"}],
+        }
+        assert [resource.fides_key for resource in tree.taxonomy.data_category] == [
+            "system"
+        ]
+        assert [resource.fides_key for resource in tree.taxonomy.data_subject] == [
+            "customer"
+        ]
+        assert tree.taxonomy.data_use == []
+
+    def test_update_normalizes_paths(self, manifest_tree_dir, monkeypatch):
+        monkeypatch.chdir(manifest_tree_dir.parent)
+        tree = manifest_tree.ManifestTree(manifest_tree_dir.name)
+        expected_manifests = tree.manifests
+
+        tree.update(
+            [
+                str(manifest_tree_dir / "categories.yml"),
+                f"./{manifest_tree_dir.name}/sub/../uses.yml",
+            ]
+        )
+        assert tree.file_paths == [
+            os.path.join(manifest_tree_dir.name, "categories.yml"),
+            os.path.join(manifest_tree_dir.name, "uses.yml"),
+        ]
+        assert tree.manifests == expected_manifests
+
+    def test_update_skips_paths_a_full_ingest_would(
+        self, manifest_tree_dir, tmp_path_factory
+    ):
+        (manifest_tree_dir / ".fidesignore").write_text("node_modules/\n")
+        outside_path = str(tmp_path_factory.mktemp("outside") / "systems.yml")
+        skipped_paths = [
+            outside_path,
+            str(manifest_tree_dir / "node_modules" / "systems.yml"),
+            str(manifest_tree_dir / ".hidden" / "systems.yml"),
+            str(manifest_tree_dir / ".systems.yml"),
+        ]
+        for skipped_path in skipped_paths:
+            os.makedirs(os.path.dirname(skipped_path), exist_ok=True)
+            manifests.write_manifest(skipped_path, [{"fides_key": "system"}], "system")
+
+        tree = manifest_tree.ManifestTree(str(manifest_tree_dir))
+        tree.update(skipped_paths)
+        assert tree.manifests == manifests.ingest_manifests(str(manifest_tree_dir))
+        assert "system" not in tree.manifests
+
+    def test_single_json_file(self, tmp_path):
+        file_path = str(tmp_path / "systems.json")
+        manifests.write_json_manifest(file_path, [{"fides_key": "system"}], "system")
+
+        tree = manifest_tree.ManifestTree(file_path)
+        assert tree.manifests == {"system": [{"fides_key": "system"}]}
+
+        manifests.write_json_manifest(file_path, [{"fides_key": "other"}], "system")
+        tree.update([file_path])
+        assert tree.manifests == {"system": [{"fides_key": "other"}]}
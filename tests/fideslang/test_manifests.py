@@ -1,3 +1,9 @@
+import asyncio
+import glob
+import json
+import os
+import stat
+
 import pytest
 import yaml
 
@@ -47,6 +53,12 @@ def test_load_yaml_into_dict(sample_manifest):
     assert expected_result == sample_manifest
 
 
+@pytest.mark.unit
+def test_yaml_backend():
+    expected_backend = "libyaml" if yaml.__with_libyaml__ else "python"
+    assert manifests.YAML_BACKEND == expected_backend
+
+
 @pytest.mark.unit
 def test_write_manifest(tmp_path):
     test_resource = {"foo": "bar", "bar": "baz"}
@@ -60,6 +72,191 @@ def test_write_manifest(tmp_path):
     assert actual_result == expected_result
 
 
+@pytest.mark.unit
+def test_write_manifest_streams_iterables(tmp_path):
+    resources = [{"fides_key": f"system_{index}"} for index in range(3)]
+    test_path = str(tmp_path / "test.yml")
+    manifests.write_manifest(test_path, iter(resources), "system")
+
+    with open(test_path, "r") as manifest:
+        assert manifest.read() == yaml.dump(
+            {"system": resources}, sort_keys=False, indent=2
+        )
+
+
+@pytest.mark.unit
+def test_write_manifest_shared_objects(tmp_path):
+    resources = []
+    for index in range(2):
+        shared_tags = [f"tag_{index}"]
+        resources.append(
+            {"fides_key": f"system_{index}", "tags": shared_tags, "labels": shared_tags}
+        )
+    test_path = str(tmp_path / "test.yml")
+    manifests.write_manifest(test_path, resources, "system")
+
+    assert manifests.load_yaml_into_dict(test_path) == {"system": resources}
+
+
+@pytest.mark.unit
+def test_write_manifest_empty(tmp_path):
+    test_path = str(tmp_path / "test.yml")
+    manifests.write_manifest(test_path, [], "system")
+    assert manifests.load_yaml_into_dict(test_path) == {"system": []}
+
+
+@pytest.mark.unit
+def test_write_manifest_is_atomic(tmp_path):
+    test_path = str(tmp_path / "test.yml")
+    manifests.write_manifest(test_path, [{"fides_key": "original"}], "system")
+
+    def failing_resources():
+        yield {"fides_key": "replacement"}
+        raise RuntimeError("Interrupted")
+
+    with pytest.raises(RuntimeError):
+        manifests.write_manifest(test_path, failing_resources(), "system")
+
+    assert manifests.load_yaml_into_dict(test_path) == {
+        "system": [{"fides_key": "original"}]
+    }
+    assert os.listdir(tmp_path) == ["test.yml"]
+
+
+@pytest.mark.unit
+def test_write_manifest_keeps_existing_mode(tmp_path):
+    test_path = str(tmp_path / "test.yml")
+    manifests.write_manifest(test_path, [{"fides_key": "original"}], "system")
+    os.chmod(test_path, 0o600)
+
+    manifests.write_manifest(test_path, [{"fides_key": "replacement"}], "system")
+    assert stat.S_IMODE(os.stat(test_path).st_mode) == 0o600
+
+
+@pytest.mark.unit
+def test_write_manifest_applies_umask(tmp_path):
+    test_path = str(tmp_path / "test.yml")
+    original_umask = os.umask(0o027)
+    try:
+        manifests.write_manifest(test_path, [{"fides_key": "system"}], "system")
+    finally:
+        os.umask(original_umask)
+    assert stat.S_IMODE(os.stat(test_path).st_mode) == 0o640
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("parallel", [False, True])
+def test_write_manifest_shards(tmp_path, parallel):
+    resources = [{"fides_key": f"system_{index}"} for index in range(11)]
+    shard_names = manifests.write_manifest_shards(
+        str(tmp_path / "systems.yml"), resources, "system", 4, parallel=parallel
+    )
+
+    assert shard_names == [str(tmp_path / f"systems.{index}.yml") for index in range(4)]
+    assert manifests.ingest_manifests(str(tmp_path)) == {"system": resources}
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("compression", ["gz", "zst"])
+def test_write_manifest_shards_compressed(tmp_path, compression):
+    resources = [{"fides_key": f"system_{index}"} for index in range(5)]
+    shard_names = manifests.write_manifest_shards(
+        str(tmp_path / f"systems.yml.{compression}"), resources, "system", 2
+    )
+
+    assert shard_names == [
+        str(tmp_path / f"systems.{index}.yml.{compression}") for index in range(2)
+    ]
+    assert manifests.ingest_manifests(str(tmp_path)) == {"system": resources}
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("shards", [0, -1])
+def test_write_manifest_shards_invalid_count(tmp_path, shards):
+    with pytest.raises(ValueError, match="shards must be at least 1"):
+        manifests.write_manifest_shards(
+            str(tmp_path / "systems.yml"), [{"fides_key": "system"}], "system", shards
+        )
+    assert os.listdir(tmp_path) == []
+
+
+@pytest.mark.unit
+def test_write_json_manifest(tmp_path):
+    test_resource = {"foo": "bar", "bar": "baz"}
+    expected_result = {"test": [{"foo": "bar", "bar": "baz"}]}
+    test_path = str(tmp_path) + "/test.json"
+    manifests.write_json_manifest(test_path, test_resource, "test")
+
+    with open(test_path, "r") as manifest:
+        actual_result = json.load(manifest)
+
+    assert actual_result == expected_result
+    assert manifests.load_json_into_dict(test_path) == expected_result
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("json_backend", ["orjson", "json"])
+def test_load_json_into_dict_backends(tmp_path, monkeypatch, json_backend):
+    if json_backend == "orjson":
+        pytest.importorskip("orjson")
+    monkeypatch.setattr(manifests, "JSON_BACKEND", json_backend)
+    test_path = str(tmp_path) + "/test.json"
+    manifests.write_json_manifest(test_path, [{"fides_key": "foo"}], "system")
+    assert manifests.load_json_into_dict(test_path) == {
+        "system": [{"fides_key": "foo"}]
+    }
+
+
+@pytest.mark.unit
+def test_ingest_manifests_mixed_yaml_and_json(tmp_path):
+    manifests.write_manifest(
+        str(tmp_path / "systems.yml"), [{"fides_key": "yaml_system"}], "system"
+    )
+    manifests.write_json_manifest(
+        str(tmp_path / "systems.json"), [{"fides_key": "json_system"}], "system"
+    )
+    assert manifests.ingest_manifests(
+        str(tmp_path), extensions=manifests.ALL_MANIFEST_EXTENSIONS
+    ) == {"system": [{"fides_key": "json_system"}, {"fides_key": "yaml_system"}]}
+    assert manifests.ingest_manifests(
+        str(tmp_path / "systems.json"), extensions=["json"]
+    ) == {"system": [{"fides_key": "json_system"}]}
+
+
+@pytest.mark.unit
+def test_ingest_manifests_json_is_opt_in(tmp_path):
+    resources = [{"fides_key": "system_1"}, {"fides_key": "system_2"}]
+    manifests.write_manifest(str(tmp_path / "systems.yml"), resources, "system")
+    manifests.write_json_manifest(str(tmp_path / "systems.json"), resources, "system")
+    (tmp_path / "package.json").write_text('{"name": "not-a-manifest"}')
+
+    assert manifests.get_manifest_list(str(tmp_path)) == [str(tmp_path / "systems.yml")]
+    assert manifests.ingest_manifests(str(tmp_path)) == {"system": resources}
+    assert manifests.get_manifest_list(
+        str(tmp_path), extensions=manifests.ALL_MANIFEST_EXTENSIONS
+    ) == [
+        str(tmp_path / "package.json"),
+        str(tmp_path / "systems.json"),
+        str(tmp_path / "systems.yml"),
+    ]
+
+
+@pytest.mark.unit
+def test_explicit_json_file_is_loaded(tmp_path):
+    resources = [{"fides_key": "system_1"}, {"fides_key": "system_2"}]
+    file_path = str(tmp_path / "systems.json")
+    manifests.write_json_manifest(file_path, resources, "system")
+
+    assert manifests.get_manifest_list(file_path) == [file_path]
+    assert manifests.ingest_manifests(file_path) == {"system": resources}
+    assert asyncio.run(manifests.ingest_manifests_async(file_path)) == {
+        "system": resources
+    }
+    assert list(manifests.iter_manifest_resources(file_path)) == [
+        ("system", resource, file_path) for resource in resources
+    ]
+
+
 @pytest.mark.unit
 def test_union_manifests(test_manifests):
     expected_result = {
@@ -155,3 +352,286 @@ def test_ingest_manifests(ingestion_manifest_directory):
             "fides_key": "another_system",
         },
     ]
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize(
+    "ingestion_manifest_directory",
+    ["populated_manifest_dir", "populated_nested_manifest_dir"],
+    indirect=["ingestion_manifest_directory"],
+)
+def test_ingest_manifests_parallel(ingestion_manifest_directory):
+    """Parallel ingestion should produce exactly the serial result, in order."""
+    serial_result = manifests.ingest_manifests(str(ingestion_manifest_directory))
+    parallel_result = manifests.ingest_manifests(
+        str(ingestion_manifest_directory), parallel=True, max_workers=2
+    )
+    assert parallel_result == serial_result
+
+
+@pytest.mark.unit
+def test_iter_manifest_resources(populated_nested_manifest_dir, test_manifests):
+    actual_result = list(
+        manifests.iter_manifest_resources(str(populated_nested_manifest_dir))
+    )
+    expected_result = [
+        (
+            resource_type,
+            resource,
+            f"{populated_nested_manifest_dir}/{manifest_name}/{manifest_name}.yml",
+        )
+        for manifest_name, manifest in test_manifests.items()
+        for resource_type, resources in sorted(manifest.items())
+        for resource in resources
+    ]
+    assert actual_result == expected_result
+
+
+@pytest.mark.unit
+def test_union_manifests_accepts_iterator(test_manifests):
+    expected_result = manifests.union_manifests(list(test_manifests.values()))
+    actual_result = manifests.union_manifests(
+        manifest for manifest in test_manifests.values()
+    )
+    assert actual_result == expected_result
+
+
+@pytest.mark.unit
+def test_union_manifests_does_not_mutate_inputs(test_manifests):
+    manifests.union_manifests(test_manifests.values())
+    assert len(test_manifests["manifest_1"]["dataset"]) == 1
+
+
+@pytest.mark.unit
+def test_union_manifests_empty():
+    assert manifests.union_manifests([]) == {}
+
+
+@pytest.fixture()
+def multi_document_manifest(tmp_path):
+    manifest_path = tmp_path / "multi_document.yml"
+    manifest_path.write_text(
+        """
+system:
+  - fides_key: system_1
+    egress: &egress
+      - fides_key: system_2
+        type: system
+  - fides_key: system_2
+    ingress: *egress
+---
+dataset:
+  - fides_key: dataset_1
+system:
+  - fides_key: system_3
+"""
+    )
+    return str(manifest_path)
+
+
+@pytest.mark.unit
+def test_load_yaml_into_dict_multi_document(multi_document_manifest):
+    expected_egress = [{"fides_key": "system_2", "type": "system"}]
+    assert manifests.load_yaml_into_dict(multi_document_manifest) == {
+        "system": [
+            {"fides_key": "system_1", "egress": expected_egress},
+            {"fides_key": "system_2", "ingress": expected_egress},
+            {"fides_key": "system_3"},
+        ],
+        "dataset": [{"fides_key": "dataset_1"}],
+    }
+
+
+@pytest.mark.unit
+def test_iter_yaml_resources(multi_document_manifest):
+    expected_egress = [{"fides_key": "system_2", "type": "system"}]
+    assert list(manifests.iter_yaml_resources(multi_document_manifest)) == [
+        ("system", {"fides_key": "system_1", "egress": expected_egress}),
+        ("system", {"fides_key": "system_2", "ingress": expected_egress}),
+        ("dataset", {"fides_key": "dataset_1"}),
+        ("system", {"fides_key": "system_3"}),
+    ]
+
+
+@pytest.mark.unit
+def test_iter_manifest_resources_stream(populated_nested_manifest_dir):
+    assert list(
+        manifests.iter_manifest_resources(
+            str(populated_nested_manifest_dir), stream=True
+        )
+    ) == list(manifests.iter_manifest_resources(str(populated_nested_manifest_dir)))
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize(
+    "ingestion_manifest_directory",
+    ["populated_manifest_dir", "populated_nested_manifest_dir"],
+    indirect=["ingestion_manifest_directory"],
+)
+def test_ingest_manifests_async(ingestion_manifest_directory):
+    actual_result = asyncio.run(
+        manifests.ingest_manifests_async(
+            str(ingestion_manifest_directory), max_concurrency=1
+        )
+    )
+    assert actual_result == manifests.ingest_manifests(
+        str(ingestion_manifest_directory)
+    )
+
+
+@pytest.mark.unit
+class TestIterManifestPaths:
+    @pytest.fixture()
+    def manifest_tree(self, tmp_path):
+        for relative_path in [
+            "a.yml",
+            "a/b.yaml",
+            "a/c.json",
+            "a-b/d.yml",
+            "notes.txt",
+            ".hidden.yml",
+            ".git/e.yml",
+            "node_modules/f.yml",
+            "nested/node_modules/g.yml",
+            "generated/h.yml",
+            "keep/generated/i.yml",
+            "scratch.yml",
+        ]:
+            path = tmp_path / relative_path
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text("system: []")
+        return tmp_path
+
+    def test_matches_sorted_glob_order(self, manifest_tree):
+        expected_paths = sorted(
+            path
+            for extension in manifests.MANIFEST_EXTENSIONS
+            for path in glob.glob(f"{manifest_tree}/**/*.{extension}", recursive=True)
+        )
+        assert list(manifests.iter_manifest_paths(str(manifest_tree))) == (
+            expected_paths
+        )
+
+    def test_fidesignore(self, manifest_tree, monkeypatch):
+        (manifest_tree / ".fidesignore").write_text(
+            "# dependencies\nnode_modules/\n\n/generated\nscratch.yml\n"
+        )
+        scanned_dirs = []
+        scandir = os.scandir
+
+        def tracking_scandir(path):
+            scanned_dirs.append(os.path.relpath(path, manifest_tree))
+            return scandir(path)
+
+        monkeypatch.setattr(os, "scandir", tracking_scandir)
+        assert list(
+            manifests.iter_manifest_paths(
+                str(manifest_tree), manifests.ALL_MANIFEST_EXTENSIONS
+            )
+        ) == [
+            str(manifest_tree / relative_path)
+            for relative_path in [
+                "a-b/d.yml",
+                "a.yml",
+                "a/b.yaml",
+                "a/c.json",
+                "keep/generated/i.yml",
+            ]
+        ]
+        assert "node_modules" not in scanned_dirs
+        assert "nested/node_modules" not in scanned_dirs
+        assert "generated" not in scanned_dirs
+
+
+@pytest.mark.unit
+def test_load_yaml_with_locations(multi_document_manifest):
+    manifest, locations = manifests.load_yaml_with_locations(multi_document_manifest)
+    assert manifest == manifests.load_yaml_into_dict(multi_document_manifest)
+    assert locations == {
+        "system": [
+            manifests.SourceLocation(multi_document_manifest, 3),
+            manifests.SourceLocation(multi_document_manifest, 7),
+            manifests.SourceLocation(multi_document_manifest, 13),
+        ],
+        "dataset": [manifests.SourceLocation(multi_document_manifest, 11)],
+    }
+    assert str(locations["dataset"][0]) == f"{multi_document_manifest}:11"
+
+
+@pytest.mark.unit
+def test_ingest_manifests_with_locations(tmp_path):
+    manifests.write_manifest(
+        str(tmp_path / "a.yml"),
+        [{"fides_key": "system_1"}, {"fides_key": "system_2"}],
+        "system",
+    )
+    manifests.write_json_manifest(
+        str(tmp_path / "b.json"), [{"fides_key": "system_3"}], "system"
+    )
+    manifest, locations = manifests.ingest_manifests_with_locations(
+        str(tmp_path), manifests.ALL_MANIFEST_EXTENSIONS
+    )
+
+    assert manifest == manifests.ingest_manifests(
+        str(tmp_path), extensions=manifests.ALL_MANIFEST_EXTENSIONS
+    )
+    assert locations == {
+        "system": [
+            manifests.SourceLocation(str(tmp_path / "a.yml"), 2),
+            manifests.SourceLocation(str(tmp_path / "a.yml"), 3),
+            manifests.SourceLocation(str(tmp_path / "b.json")),
+        ]
+    }
+
+
+@pytest.mark.unit
+class TestCompressedManifests:
+    resources = [{"fides_key": f"system_{index}"} for index in range(3)]
+
+    def test_write_and_load(self, tmp_path, compression):
+        yaml_path = str(tmp_path / f"systems.yml.{compression}")
+        json_path = str(tmp_path / f"systems.json.{compression}")
+        manifests.write_manifest(yaml_path, self.resources, "system")
+        manifests.write_json_manifest(json_path, self.resources, "system")
+
+        expected_magic = b"\x1f\x8b" if compression == "gz" else b"\x28\xb5\x2f\xfd"
+        for path in [yaml_path, json_path]:
+            with open(path, "rb") as compressed_file:
+                assert compressed_file.read(len(expected_magic)) == expected_magic
+            assert manifests.load_manifest_into_dict(path) == {"system": self.resources}
+
+    def test_ingest(self, tmp_path, compression):
+        manifests.write_manifest(
+            str(tmp_path / f"a.yml.{compression}"), self.resources[:2], "system"
+        )
+        manifests.write_json_manifest(
+            str(tmp_path / f"b.json.{compression}"), self.resources[2:], "system"
+        )
+        (tmp_path / "c.txt.gz").write_bytes(b"")
+
+        extensions = manifests.ALL_MANIFEST_EXTENSIONS
+        assert manifests.get_manifest_list(str(tmp_path), extensions) == [
+            str(tmp_path / f"a.yml.{compression}"),
+            str(tmp_path / f"b.json.{compression}"),
+        ]
+        assert manifests.ingest_manifests(str(tmp_path), extensions=extensions) == {
+            "system": self.resources
+        }
+        assert list(
+            manifests.iter_manifest_resources(
+                str(tmp_path), stream=True, extensions=extensions
+            )
+        ) == [
+            ("system", resource, path)
+            for resource, path in zip(
+                self.resources,
+                [str(tmp_path / f"a.yml.{compression}")] * 2
+                + [str(tmp_path / f"b.json.{compression}")],
+            )
+        ]
+
+    def test_locations(self, tmp_path, compression):
+        yaml_path = str(tmp_path / f"systems.yml.{compression}")
+        manifests.write_manifest(yaml_path, self.resources, "system")
+        _, locations = manifests.load_manifest_with_locations(yaml_path)
+        assert [location.line for location in locations["system"]] == [2, 3, 4]
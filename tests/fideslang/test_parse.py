@@ -1,6 +1,9 @@
+import asyncio
+
 import pytest
+from pydantic import ValidationError
 
-from fideslang import models
+from fideslang import manifests, models
 from fideslang import parse
 
 
@@ -81,3 +84,332 @@ def test_load_manifests_into_taxonomy():
         ]
     )
     assert parse.load_manifests_into_taxonomy(manifest_dict) == expected_taxonomy
+
+
+@pytest.mark.unit
+def test_load_manifests_into_taxonomy_async():
+    manifest_dict = {
+        "data_category": [
+            {
+                "name": "User Data",
+                "fides_key": "user",
+                "description": "Test top-level category",
+            }
+        ]
+    }
+    actual_result = asyncio.run(parse.load_manifests_into_taxonomy_async(manifest_dict))
+    assert actual_result == parse.load_manifests_into_taxonomy(manifest_dict)
+
+
+@pytest.mark.unit
+def test_load_manifests_into_taxonomy_reports_source_location(capsys):
+    manifest_dict = {
+        "data_category": [
+            {"fides_key": "user", "name": "User Data"},
+            {"name": "Missing Fides Key"},
+        ]
+    }
+    source_locations = {
+        "data_category": [
+            manifests.SourceLocation("categories.yml", 2),
+            manifests.SourceLocation("categories.yml", 4),
+        ]
+    }
+    with pytest.raises(SystemExit):
+        parse.load_manifests_into_taxonomy(manifest_dict, source_locations)
+    assert "Failed to parse data_category from categories.yml:4" in (
+        capsys.readouterr().out
+    )
+
+
+@pytest.fixture()
+def manifest_with_failures():
+    return {
+        "data_category": [
+            {"fides_key": "user", "name": "User Data"},
+            {"name": "Missing Fides Key"},
+            {"fides_key": "user.contact", "parent_key": "user"},
+            {"fides_key": "bad key"},
+        ],
+        "data-use": [{"fides_key": "marketing"}],
+        "data_use": [{"fides_key": "marketing", "name": "Marketing"}],
+    }
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize("parallel", [False, True])
+def test_parse_manifests_collects_failures(manifest_with_failures, parallel):
+    taxonomy, failures = parse.parse_manifests(
+        manifest_with_failures, parallel=parallel, max_workers=2
+    )
+    assert [resource.fides_key for resource in taxonomy.data_category] == [
+        "user",
+        "user.contact",
+    ]
+    assert [resource.fides_key for resource in taxonomy.data_use] == ["marketing"]
+    assert [
+        (failure.resource_type, failure.position, failure.fides_key)
+        for failure in failures
+    ] == [
+        ("data_category", 1, None),
+        ("data_category", 3, "bad key"),
+        ("data-use", 0, "marketing"),
+    ]
+    assert failures[0].errors[0]["loc"] == ("fides_key",)
+    assert failures[0].errors[0]["type"] == "value_error.missing"
+    assert failures[2].message == "This resource type does not exist: data-use"
+
+
+@pytest.mark.unit
+def test_parse_manifests_source_locations(manifest_with_failures):
+    source_locations = {
+        "data_category": [
+            manifests.SourceLocation("categories.yml", line) for line in range(1, 5)
+        ]
+    }
+    _, failures = parse.parse_manifests(manifest_with_failures, source_locations)
+    assert [str(failure.source_location) for failure in failures] == [
+        "categories.yml:2",
+        "categories.yml:4",
+        "None",
+    ]
+
+
+@pytest.mark.unit
+def test_get_resource_batches():
+    raw_manifests = {"data_category": list(range(5)), "data_use": [], "system": [0]}
+    assert parse.get_resource_batches(raw_manifests, batch_size=2) == [
+        ("data_category", 0, [0, 1]),
+        ("data_category", 2, [2, 3]),
+        ("data_category", 4, [4]),
+        ("system", 0, [0]),
+    ]
+    assert parse.get_resource_batches(raw_manifests) == [
+        ("data_category", 0, [0, 1, 2, 3, 4]),
+        ("system", 0, [0]),
+    ]
+
+
+@pytest.mark.unit
+def test_build_taxonomy():
+    parsed_manifests = {
+        "data_category": [models.DataCategory(fides_key="user", name="User Data")],
+        "evaluation": [
+            models.Evaluation(fides_key="evaluation", status="PASS", details=[])
+        ],
+    }
+    taxonomy = parse.build_taxonomy(parsed_manifests)
+    assert taxonomy == models.Taxonomy.parse_obj(parsed_manifests)
+    assert taxonomy.__fields_set__ == {"data_category"}
+    assert taxonomy.data_use == []
+    assert taxonomy.data_category[0] is parsed_manifests["data_category"][0]
+
+
+@pytest.mark.unit
+def test_load_manifests_into_taxonomy_parallel():
+    manifest_dict = {
+        "data_category": [
+            {"fides_key": f"category_{index}", "name": f"Category {index}"}
+            for index in range(20)
+        ],
+        "evaluation": [{"fides_key": "evaluation", "status": "PASS", "details": []}],
+        "data_use": [{"fides_key": "marketing", "name": "Marketing"}],
+        "data_subject": [],
+    }
+    parallel_taxonomy = parse.load_manifests_into_taxonomy(
+        manifest_dict, parallel=True, max_workers=2
+    )
+    serial_taxonomy = parse.load_manifests_into_taxonomy(manifest_dict)
+    assert parallel_taxonomy == serial_taxonomy
+    assert parallel_taxonomy.__fields_set__ == serial_taxonomy.__fields_set__
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize(
+    "manifest_dict",
+    [
+        {"data_category": [{"fides_key": "user"}, {"name": "Missing Fides Key"}]},
+        {"data_category": [{"fides_key": "user"}], "data-use": [{"fides_key": "x"}]},
+    ],
+)
+def test_load_manifests_into_taxonomy_parallel_errors(manifest_dict, capsys):
+    source_locations = {
+        "data_category": [
+            manifests.SourceLocation("categories.yml", 2),
+            manifests.SourceLocation("categories.yml", 4),
+        ]
+    }
+    with pytest.raises(SystemExit) as serial_error:
+        parse.load_manifests_into_taxonomy(manifest_dict, source_locations)
+    serial_output = capsys.readouterr().out
+
+    with pytest.raises(SystemExit) as parallel_error:
+        parse.load_manifests_into_taxonomy(
+            manifest_dict, source_locations, parallel=True, max_workers=2
+        )
+    assert capsys.readouterr().out == serial_output
+    assert str(parallel_error.value) == str(serial_error.value)
+
+
+@pytest.mark.unit
+class TestStructuralParse:
+    dataset = {
+        "fides_key": "dataset",
+        "data_categories": ["user"],
+        "collections": [
+            {
+                "name": "users",
+                "fields": [
+                    {"name": "email", "data_categories": ["user.contact.email"]},
+                    {
+                        "name": "address",
+                        "fields": [{"name": "city", "data_categories": ["user"]}],
+                    },
+                ],
+            }
+        ],
+    }
+
+    def test_builds_nested_models(self):
+        dataset = parse.parse_dict("dataset", self.dataset, structural=True)
+        assert isinstance(dataset, models.Dataset)
+        nested_field = dataset.collections[0].fields[1].fields[0]
+        assert isinstance(nested_field, models.DatasetField)
+        assert nested_field.data_categories == ["user"]
+        assert dataset.__fields_set__ == {"fides_key", "data_categories", "collections"}
+
+    def test_validate_resource(self):
+        dataset = parse.parse_dict("dataset", self.dataset, structural=True)
+        assert parse.validate_resource(dataset) == parse.parse_dict(
+            "dataset", self.dataset
+        )
+
+    def test_skips_validators(self):
+        data_category = {
+            "fides_key": "user",
+            "version_added": "not a version",
+            "is_default": True,
+        }
+        parsed = parse.parse_dict("data_category", data_category, structural=True)
+        assert parsed.version_added == "not a version"
+        with pytest.raises(ValidationError):
+            parse.validate_resource(parsed)
+
+    @pytest.mark.parametrize(
+        "dataset,message",
+        [
+            ({"collections": []}, "fides_key: field required"),
+            ({"fides_key": "bad key", "collections": []}, "fides_key: FidesKeys"),
+            ({"fides_key": "dataset", "collections": {}}, "collections: value is"),
+            (
+                {
+                    "fides_key": "dataset",
+                    "collections": [
+                        {"name": "users", "fields": [{"name": None}]},
+                    ],
+                },
+                "collections.0.fields.0.name: none is not an allowed value",
+            ),
+            (
+                {
+                    "fides_key": "dataset",
+                    "collections": [
+                        {
+                            "name": "users",
+                            "fields": [{"name": "a", "data_categories": ["bad key"]}],
+                        }
+                    ],
+                },
+                "collections.0.fields.0.data_categories.0: FidesKeys",
+            ),
+            (
+                {"fides_key": "dataset", "name": ["dataset"], "collections": []},
+                "name: str type expected",
+            ),
+            (
+                {
+                    "fides_key": "dataset",
+                    "collections": [
+                        {
+                            "name": "users",
+                            "fields": [
+                                {"name": "id", "fides_meta": {"primary_key": "perhaps"}}
+                            ],
+                        }
+                    ],
+                },
+                "collections.0.fields.0.fides_meta.primary_key: value could not be parsed to a boolean",
+            ),
+            (
+                {
+                    "fides_key": "dataset",
+                    "collections": [
+                        {
+                            "name": "users",
+                            "fields": [
+                                {"name": "id", "fides_meta": {"length": "long"}}
+                            ],
+                        }
+                    ],
+                },
+                "collections.0.fields.0.fides_meta.length: value is not a valid integer",
+            ),
+        ],
+    )
+    def test_structural_errors(self, dataset, message):
+        with pytest.raises(SystemExit) as err:
+            parse.parse_dict("dataset", dataset, structural=True)
+        assert str(err.value).startswith(message)
+
+    def test_fidesops_meta(self):
+        dataset = {
+            "fides_key": "dataset",
+            "fidesops_meta": {"after": ["other_dataset"]},
+            "collections": [
+                {
+                    "name": "users",
+                    "fidesops_meta": {"skip_processing": True},
+                    "fields": [{"name": "id", "fidesops_meta": {"primary_key": True}}],
+                }
+            ],
+        }
+        parsed = parse.parse_dict("dataset", dataset, structural=True)
+        assert parsed.collections[0].fields[0].fides_meta.primary_key is True
+        full_parse = parse.parse_dict("dataset", dataset)
+        assert full_parse.collections[0].fields[0].fides_meta.primary_key is True
+        assert parse.validate_resource(parsed) == full_parse
+
+    def test_coerces_like_a_full_parse(self):
+        dataset = {
+            "fides_key": 123,
+            "name": 2021,
+            "collections": [
+                {
+                    "name": "users",
+                    "fields": [
+                        {
+                            "name": "id",
+                            "fides_meta": {"primary_key": "true", "length": "10"},
+                        }
+                    ],
+                }
+            ],
+        }
+        parsed = parse.parse_dict("dataset", dataset, structural=True)
+        assert parsed.fides_key == "123"
+        assert parsed.name == "2021"
+        assert parsed.collections[0].fields[0].fides_meta.primary_key is True
+        assert parsed.collections[0].fields[0].fides_meta.length == 10
+        assert parse.validate_resource(parsed) == parse.parse_dict("dataset", dataset)
+
+    @pytest.mark.parametrize("parallel", [False, True])
+    def test_load_manifests_into_taxonomy(self, parallel):
+        taxonomy = parse.load_manifests_into_taxonomy(
+            {"dataset": [self.dataset]}, parallel=parallel, structural=True
+        )
+        assert (
+            parse.validate_resource(taxonomy.dataset[0])
+            == parse.load_manifests_into_taxonomy({"dataset": [self.dataset]}).dataset[
+                0
+            ]
+        )
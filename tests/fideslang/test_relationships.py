@@ -129,6 +129,56 @@ class TestFindReferencedKeys:
         referenced_keys = relationships.find_referenced_fides_keys(resource)
         assert referenced_keys == set(expected_referenced_key)
 
+    def test_find_referenced_fides_keys_optional_lists(self) -> None:
+        dataset = Dataset(
+            fides_key="dataset_1",
+            data_categories=["dataset_data_category_1"],
+            collections=[
+                DatasetCollection(
+                    name="dataset_collection_1",
+                    fields=[
+                        DatasetField(
+                            name="dataset_field_1",
+                            fields=[
+                                DatasetField(
+                                    name="dataset_field_2",
+                                    data_categories=["dataset_field_data_category_2"],
+                                )
+                            ],
+                        )
+                    ],
+                )
+            ],
+        )
+        referenced_keys = relationships.find_referenced_fides_keys(dataset)
+        assert referenced_keys == {
+            "dataset_1",
+            "default_organization",
+            "dataset_data_category_1",
+            "dataset_field_data_category_2",
+        }
+
+    def test_find_referenced_fides_keys_not_a_model(self) -> None:
+        assert relationships.find_referenced_fides_keys("key_1") == set()
+        assert relationships.find_referenced_fides_keys(MatchesEnum.ANY) == set()
+
+    def test_get_reference_plan(self) -> None:
+        plan = relationships.get_reference_plan(PrivacyDeclaration)
+        assert plan == relationships.get_reference_plan(PrivacyDeclaration)
+        assert plan.keys == ("data_use",)
+        assert plan.key_lists == (
+            "data_categories",
+            "data_subjects",
+            "dataset_references",
+            "egress",
+            "ingress",
+        )
+        assert plan.nested == ("cookies",)
+        assert relationships.get_reference_plan(DatasetField).nested == (
+            "fides_meta",
+            "fields",
+        )
+
 
 @pytest.mark.unit
 class TestGetReferencedMissingKeys:
@@ -261,3 +311,257 @@ class TestGetReferencedMissingKeys:
         }
         referenced_keys = relationships.get_referenced_missing_keys(taxonomy)
         assert not referenced_keys.difference(expected_referenced_key)
+
+    def test_get_referenced_missing_keys_across_resource_types(self):
+        taxonomy = Taxonomy(
+            data_category=[DataCategory(fides_key="user")],
+            data_use=[DataUse(fides_key="marketing")],
+            organization=[Organization(fides_key="default_organization")],
+            system=[
+                System(
+                    fides_key="system_1",
+                    system_type="system_type_1",
+                    privacy_declarations=[
+                        PrivacyDeclaration(
+                            name="privacy_declaration_1",
+                            data_categories=["user"],
+                            data_use="marketing",
+                            data_subjects=[],
+                        )
+                    ],
+                )
+            ],
+            dataset=None,
+        )
+        assert relationships.get_referenced_missing_keys(taxonomy) == set()
+
+
+@pytest.mark.unit
+class TestDependencyGraph:
+    @pytest.fixture()
+    def taxonomy(self):
+        return Taxonomy(
+            organization=[Organization(fides_key="default_organization")],
+            data_category=[
+                DataCategory(fides_key="user"),
+                DataCategory(fides_key="user.contact", parent_key="user"),
+            ],
+            data_use=[DataUse(fides_key="marketing")],
+            system=[
+                System(
+                    fides_key="system_1",
+                    system_type="system_type_1",
+                    privacy_declarations=[
+                        PrivacyDeclaration(
+                            name="privacy_declaration_1",
+                            data_categories=["user.contact"],
+                            data_use="marketing",
+                            data_subjects=["customer"],
+                        )
+                    ],
+                )
+            ],
+        )
+
+    def test_edges(self, taxonomy):
+        graph = relationships.DependencyGraph(taxonomy)
+        system = relationships.ResourceNode("system", "system_1")
+        assert len(graph) == 5
+        assert system in graph
+        assert graph.get_dependencies(system) == [
+            relationships.ResourceNode("organization", "default_organization"),
+            relationships.ResourceNode("data_use", "marketing"),
+            relationships.ResourceNode("data_category", "user.contact"),
+        ]
+        assert graph.get_dependents(
+            relationships.ResourceNode("data_category", "user.contact")
+        ) == [system]
+        assert graph.missing_keys == {system: {"customer"}}
+
+    def test_edges_to_other_types_with_the_same_key(self):
+        taxonomy = Taxonomy(
+            data_use=[DataUse(fides_key="analytics")],
+            system=[
+                System(
+                    fides_key="analytics",
+                    system_type="system_type_1",
+                    privacy_declarations=[
+                        PrivacyDeclaration(
+                            name="privacy_declaration_1",
+                            data_categories=[],
+                            data_use="analytics",
+                            data_subjects=[],
+                        )
+                    ],
+                    egress=[DataFlow(fides_key="analytics", type="system")],
+                )
+            ],
+        )
+        graph = relationships.DependencyGraph(taxonomy)
+        system = relationships.ResourceNode("system", "analytics")
+        data_use = relationships.ResourceNode("data_use", "analytics")
+        assert graph.get_dependencies(system) == [data_use]
+        assert graph.get_dependents(data_use) == [system]
+        assert graph.topological_order() == [data_use, system]
+
+    def test_topological_order(self, taxonomy):
+        graph = relationships.DependencyGraph(taxonomy)
+        order = graph.topological_order()
+        assert sorted(order) == sorted(graph.nodes)
+        for position, node in enumerate(order):
+            for dependency in graph.get_dependencies(node):
+                assert order.index(dependency) < position
+
+    def test_strongly_connected_components(self, taxonomy):
+        graph = relationships.DependencyGraph(taxonomy)
+        components = graph.strongly_connected_components()
+        assert all(len(component) == 1 for component in components)
+        order = [component[0] for component in components]
+        for position, node in enumerate(order):
+            for dependency in graph.get_dependencies(node):
+                assert order.index(dependency) < position
+
+    def test_cycle(self):
+        taxonomy = Taxonomy(
+            system=[
+                System.construct(
+                    fides_key=fides_key,
+                    egress=[DataFlow(fides_key=other_key, type="system")],
+                    privacy_declarations=[],
+                )
+                for fides_key, other_key in [
+                    ("system_1", "system_2"),
+                    ("system_2", "system_1"),
+                ]
+            ],
+            data_category=[DataCategory(fides_key="user")],
+        )
+        graph = relationships.DependencyGraph(taxonomy)
+        components = graph.strongly_connected_components()
+        assert [sorted(component) for component in components] == [
+            [relationships.ResourceNode("data_category", "user")],
+            [
+                relationships.ResourceNode("system", "system_1"),
+                relationships.ResourceNode("system", "system_2"),
+            ],
+        ]
+        with pytest.raises(relationships.DependencyCycleError):
+            graph.topological_order()
+
+    def test_deep_graph(self):
+        taxonomy = Taxonomy(
+            data_category=[
+                DataCategory.construct(
+                    fides_key=f"category_{index}",
+                    parent_key=f"category_{index - 1}" if index else None,
+                )
+                for index in reversed(range(5000))
+            ]
+        )
+        graph = relationships.DependencyGraph(taxonomy)
+        order = [node.fides_key for node in graph.topological_order()]
+        assert order == [f"category_{index}" for index in range(5000)]
+        assert len(graph.strongly_connected_components()) == 5000
+
+
+@pytest.mark.unit
+class TestReverseReferenceIndex:
+    @pytest.fixture()
+    def taxonomy(self):
+        return Taxonomy(
+            data_category=[
+                DataCategory(fides_key="user"),
+                DataCategory(fides_key="user.contact", parent_key="user"),
+            ],
+            dataset=[
+                Dataset(
+                    fides_key="dataset_1",
+                    collections=[
+                        DatasetCollection(
+                            name="users",
+                            fields=[
+                                DatasetField(name="id"),
+                                DatasetField(
+                                    name="email", data_categories=["user.contact"]
+                                ),
+                            ],
+                        )
+                    ],
+                )
+            ],
+            system=[
+                System(
+                    fides_key="system_1",
+                    system_type="system_type_1",
+                    egress=[
+                        DataFlow(
+                            fides_key="dataset_1",
+                            type="dataset",
+                            data_categories=["user.contact"],
+                        )
+                    ],
+                    privacy_declarations=[
+                        PrivacyDeclaration(
+                            name="privacy_declaration_1",
+                            data_categories=["user", "user.contact"],
+                            data_use="marketing",
+                            data_subjects=["customer"],
+                        )
+                    ],
+                )
+            ],
+            policy=[
+                Policy(
+                    fides_key="policy_1",
+                    rules=[
+                        PolicyRule(
+                            name="policy_rule_1",
+                            data_categories={
+                                "values": ["user.contact"],
+                                "matches": MatchesEnum.ANY,
+                            },
+                            data_uses={"values": [], "matches": MatchesEnum.ANY},
+                            data_subjects={"values": [], "matches": MatchesEnum.ANY},
+                        )
+                    ],
+                )
+            ],
+        )
+
+    def test_get_references(self, taxonomy):
+        reverse_index = relationships.ReverseReferenceIndex(taxonomy)
+        Reference = relationships.Reference
+        assert reverse_index.get_references("user.contact") == [
+            Reference("dataset", "dataset_1", "collections.0.fields.0.data_categories"),
+            Reference("system", "system_1", "egress.0.data_categories"),
+            Reference("system", "system_1", "privacy_declarations.0.data_categories"),
+            Reference("policy", "policy_1", "rules.0.data_categories.values"),
+        ]
+        assert reverse_index.get_references("dataset_1") == [
+            Reference("system", "system_1", "egress.0.fides_key")
+        ]
+        assert reverse_index.get_references("user") == [
+            Reference("data_category", "user.contact", "parent_key"),
+            Reference("system", "system_1", "privacy_declarations.0.data_categories"),
+        ]
+        assert "customer" in reverse_index
+        assert "policy_1" not in reverse_index
+        assert reverse_index.get_references("policy_1") == []
+
+    def test_get_referencing_resources(self, taxonomy):
+        reverse_index = relationships.ReverseReferenceIndex(taxonomy)
+        assert reverse_index.get_referencing_resources("user.contact") == [
+            relationships.ResourceNode("dataset", "dataset_1"),
+            relationships.ResourceNode("system", "system_1"),
+            relationships.ResourceNode("policy", "policy_1"),
+        ]
+
+    def test_matches_find_referenced_fides_keys(self, taxonomy):
+        for resource_type in taxonomy.__fields_set__:
+            for resource in getattr(taxonomy, resource_type):
+                assert {
+                    fides_key
+                    for _, fides_key in relationships.iter_references(resource)
+                } | {resource.fides_key} == relationships.find_referenced_fides_keys(
+                    resource
+                )
@@ -0,0 +1,96 @@
+import pytest
+
+from fideslang import utils
+from fideslang.models import DataCategory, DataUse, System, Taxonomy
+
+
+@pytest.fixture()
+def taxonomy():
+    return Taxonomy(
+        data_category=[
+            DataCategory(fides_key="user"),
+            DataCategory(fides_key="user.contact", parent_key="user"),
+        ],
+        data_use=[DataUse(fides_key="user")],
+    )
+
+
+@pytest.mark.unit
+class TestTaxonomyIndex:
+    def test_get_matches_get_resource_by_fides_key(self, taxonomy):
+        taxonomy_index = utils.TaxonomyIndex(taxonomy)
+        for fides_key in ["user", "user.contact", "missing"]:
+            assert taxonomy_index.get(fides_key) == utils.get_resource_by_fides_key(
+                taxonomy, fides_key
+            )
+        assert set(taxonomy_index.get("user")) == {"data_category", "data_use"}
+        assert "user.contact" in taxonomy_index
+        assert len(taxonomy_index) == 2
+
+    def test_get_many(self, taxonomy):
+        taxonomy_index = utils.TaxonomyIndex(taxonomy)
+        assert taxonomy_index.get_many(["user.contact", "missing"]) == {
+            "user.contact": {"data_category": taxonomy.data_category[1]},
+            "missing": None,
+        }
+
+    def test_add(self, taxonomy):
+        taxonomy_index = utils.TaxonomyIndex(taxonomy)
+        replacement = DataCategory(
+            fides_key="user.contact", name="Contact", parent_key="user"
+        )
+        taxonomy_index.add("data_category", replacement)
+        assert [resource.fides_key for resource in taxonomy.data_category] == [
+            "user",
+            "user.contact",
+        ]
+        assert taxonomy.data_category[1] is replacement
+
+        data_use = DataUse(fides_key="marketing")
+        taxonomy_index.add("data_use", data_use)
+        assert taxonomy_index.get("marketing") == {"data_use": data_use}
+        assert utils.get_resource_by_fides_key(taxonomy, "marketing") == {
+            "data_use": data_use
+        }
+
+    def test_add_replaces_in_place(self, taxonomy):
+        taxonomy_index = utils.TaxonomyIndex(taxonomy)
+        replacement = DataCategory(fides_key="user", name="User")
+        taxonomy_index.add("data_category", replacement)
+        assert [resource.fides_key for resource in taxonomy.data_category] == [
+            "user",
+            "user.contact",
+        ]
+        assert taxonomy.data_category[0] is replacement
+
+    def test_add_does_not_mutate_shared_lists(self, taxonomy):
+        data_uses = taxonomy.data_use
+        other_taxonomy = Taxonomy.construct(data_use=data_uses)
+        utils.TaxonomyIndex(taxonomy).add("data_use", DataUse(fides_key="marketing"))
+        assert [resource.fides_key for resource in other_taxonomy.data_use] == ["user"]
+
+    def test_add_to_unset_resource_type(self, taxonomy):
+        taxonomy_index = utils.TaxonomyIndex(taxonomy)
+        taxonomy_index.add(
+            "system",
+            System(fides_key="system", system_type="x", privacy_declarations=[]),
+        )
+        assert "system" in taxonomy.__fields_set__
+        assert utils.get_resource_by_fides_key(taxonomy, "system") == (
+            taxonomy_index.get("system")
+        )
+
+    def test_add_invalid_resource_type(self, taxonomy):
+        with pytest.raises(ValueError):
+            utils.TaxonomyIndex(taxonomy).add("data-use", DataUse(fides_key="x"))
+
+    def test_remove(self, taxonomy):
+        taxonomy_index = utils.TaxonomyIndex(taxonomy)
+        data_use = taxonomy.data_use[0]
+        assert taxonomy_index.remove("data_use", "user") is data_use
+        assert taxonomy.data_use == []
+        assert set(taxonomy_index.get("user")) == {"data_category"}
+
+        assert taxonomy_index.remove("data_category", "user.contact")
+        assert "user.contact" not in taxonomy_index
+        assert taxonomy_index.remove("data_category", "user.contact") is None